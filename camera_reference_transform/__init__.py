@@ -12,14 +12,22 @@ bl_info = {
     "category": "Camera",
 }
 
+from importlib.util import find_spec
+
 
 reloadable_modules = (
     "keymaps",
     "properties",
     "preferences",
+    "overlay",
+    "playback",
+    "streaming",
+    "browser",
+    "remote",
     "background_move",
     "background_rotate",
     "background_scale",
+    "background_fit",
 )
 
 
@@ -34,31 +42,51 @@ if "bpy" in locals():
         for module in reloadable_modules:
             if module in locals():
                 importlib.reload(locals()[module])
-else:
+# outside Blender only the bpy-free utils, such as modules.utils.transform, can be imported
+elif find_spec("bpy") is not None:
     from .modules import properties
     from .modules import preferences
+    from .modules import overlay
+    from .modules import playback
+    from .modules import streaming
+    from .modules import browser
+    from .modules import remote
     from .modules.operators import background_move
     from .modules.operators import background_rotate
     from .modules.operators import background_scale
+    from .modules.operators import background_fit
     from .modules import keymaps
 
 
-import bpy
+if find_spec("bpy") is not None:
+    import bpy
 
 
 def register():
     properties.register()
     preferences.register()
+    overlay.register()
+    playback.register()
+    streaming.register()
     background_move.register()
     background_rotate.register()
     background_scale.register()
+    background_fit.register()
+    browser.register()
     keymaps.register()
+    remote.register()
 
 
 def unregister():
+    remote.unregister()
     keymaps.unregister()
+    browser.unregister()
+    background_fit.unregister()
     background_move.unregister()
     background_rotate.unregister()
     background_scale.unregister()
+    streaming.unregister()
+    playback.unregister()
+    overlay.unregister()
     preferences.unregister()
     properties.unregister()
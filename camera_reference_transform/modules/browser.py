@@ -0,0 +1,249 @@
+import os
+from concurrent.futures import Future
+from typing import Optional
+
+import bpy
+import bpy.utils.previews
+import numpy as np
+from bpy.types import CameraBackgroundImage
+from bpy.types import Image
+
+from .utils.cache import get_cache_directory
+from .utils.cache import get_file_key
+from .utils.thumbnails import get_thumbnail_size
+from .utils.thumbnails import load_thumbnail
+from .utils.thumbnails import make_thumbnail
+from .utils.thumbnails import save_thumbnail
+from .utils.tiles import oiio
+from .utils.workers import get_executor
+from .utils.workers import shutdown_executor
+
+TRANSFORMS = (
+    ('MOVE', "Move", 'VIEW_PAN'),
+    ('ROTATE', "Rotate", 'DRIVER_ROTATIONAL_DIFFERENCE'),
+    ('SCALE', "Scale", 'FULLSCREEN_ENTER'),
+)
+
+previews: Optional[bpy.utils.previews.ImagePreviewCollection] = None
+# cache key -> job generating thumbnail in worker thread
+thumbnail_jobs: dict[str, Future] = {}
+# cache key -> source path, generated on main thread when OpenImageIO is not available
+main_thread_queue: dict[str, str] = {}
+failed_thumbnails: set[str] = set()
+
+
+def get_thumbnail_path(key: str) -> str:
+    return os.path.join(get_cache_directory("thumbnails"), f"{key}.npy")
+
+
+def make_thumbnail_with_blender(source_path: str, thumbnail_path: str) -> np.ndarray:
+    image = bpy.data.images.load(source_path, check_existing=False)
+    try:
+        width, height = get_thumbnail_size(*image.size)
+        image.scale(width, height)
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+
+    pixels = (np.clip(pixels, 0, 1) * 255 + 0.5).astype(np.uint8).reshape(height, width, 4)
+    save_thumbnail(thumbnail_path, pixels)
+    return pixels
+
+
+def add_preview(key: str, pixels: np.ndarray) -> int:
+    height, width = pixels.shape[:2]
+    preview = previews.new(key)
+    preview.image_size = (width, height)
+    preview.image_pixels_float.foreach_set((pixels.astype(np.float32) / 255).ravel())
+    return preview.icon_id
+
+
+def get_image_icon(image: Image) -> int:
+    """Return icon of image thumbnail, 0 while the thumbnail is being generated."""
+    if image.source == 'GENERATED' or image.packed_file:
+        # image is in memory anyway
+        image.preview_ensure()
+        return image.preview.icon_id
+    if image.source not in {'FILE', 'SEQUENCE'}:
+        return 0
+
+    path = bpy.path.abspath(image.filepath, library=image.library)
+    if not os.path.isfile(path):
+        return 0
+
+    key = get_file_key(path)
+    preview = previews.get(key)
+    if preview is not None:
+        return preview.icon_id
+    if key in thumbnail_jobs or key in main_thread_queue or key in failed_thumbnails:
+        return 0
+
+    pixels = load_thumbnail(get_thumbnail_path(key))
+    if pixels is not None:
+        return add_preview(key, pixels)
+
+    if oiio is not None:
+        thumbnail_jobs[key] = get_executor().submit(make_thumbnail, path, get_thumbnail_path(key))
+    else:
+        main_thread_queue[key] = path
+    if not bpy.app.timers.is_registered(process_thumbnails):
+        bpy.app.timers.register(process_thumbnails, first_interval=0.1)
+    return 0
+
+
+def get_background_icon(bg: CameraBackgroundImage) -> int:
+    if bg.source != 'IMAGE' or bg.image is None:
+        return 0
+    return get_image_icon(bg.image)
+
+
+def process_thumbnails() -> Optional[float]:
+    """Show thumbnails generated in worker threads, generate one on main thread if there is no OpenImageIO."""
+    finished = False
+    for key, job in list(thumbnail_jobs.items()):
+        if job.done():
+            del thumbnail_jobs[key]
+            if job.exception() is None:
+                if key not in previews:
+                    add_preview(key, job.result())
+            else:
+                failed_thumbnails.add(key)
+            finished = True
+
+    if main_thread_queue:
+        key, path = main_thread_queue.popitem()
+        try:
+            add_preview(key, make_thumbnail_with_blender(path, get_thumbnail_path(key)))
+        except (RuntimeError, OSError):
+            failed_thumbnails.add(key)
+        finished = True
+
+    if finished:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    return 0.1 if thumbnail_jobs or main_thread_queue else None
+
+
+class CAMERA_OT_background_browse(bpy.types.Operator):
+    """Make the camera active and transform its background"""
+
+    bl_idname = "camera.background_browse"
+    bl_label = "Transform Camera Background"
+    bl_options = {'INTERNAL'}
+
+    camera: bpy.props.StringProperty(name="Camera", options={'SKIP_SAVE'})
+    index: bpy.props.IntProperty(name="Index", options={'SKIP_SAVE'})
+    transform: bpy.props.EnumProperty(
+        name="Transform",
+        items=[(identifier, name, "") for identifier, name, _icon in TRANSFORMS],
+        options={'SKIP_SAVE'},
+    )
+
+    @classmethod
+    def description(cls, context, properties):
+        name = next(name for identifier, name, _icon in TRANSFORMS if identifier == properties.transform)
+        return f"{name} background of the camera, making it active"
+
+    @classmethod
+    def poll(cls, context):
+        return context.area and context.area.type == 'VIEW_3D'
+
+    def invoke(self, context, event):
+        cam = context.view_layer.objects.get(self.camera)
+        if cam is None or cam.type != 'CAMERA':
+            self.report({'WARNING'}, f"Camera {self.camera} not found")
+            return {'CANCELLED'}
+
+        region = next((region for region in context.area.regions if region.type == 'WINDOW'), None)
+        if region is None:
+            return {'CANCELLED'}
+
+        for ob in context.selected_objects:
+            ob.select_set(False)
+        cam.select_set(True)
+        context.view_layer.objects.active = cam
+        context.scene.camera = cam
+        context.space_data.region_3d.view_perspective = 'CAMERA'
+
+        operator = getattr(bpy.ops.camera, f"background_{self.transform.lower()}")
+        with context.temp_override(region=region):
+            result = operator('INVOKE_DEFAULT', index=self.index)
+        return {'FINISHED'} if result & {'RUNNING_MODAL', 'FINISHED'} else {'CANCELLED'}
+
+
+class VIEW3D_PT_camera_backgrounds(bpy.types.Panel):
+    bl_label = "Camera Backgrounds"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "View"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+
+        cameras = [ob for ob in context.view_layer.objects if ob.type == 'CAMERA' and ob.data.background_images]
+        if not cameras:
+            layout.label(text="No cameras with backgrounds")
+            return
+
+        for cam in cameras:
+            box = layout.box()
+            box.label(text=cam.name, icon='VIEW_CAMERA' if cam == context.scene.camera else 'CAMERA_DATA')
+
+            flow = box.grid_flow(row_major=True, even_columns=True)
+            for i, bg in enumerate(cam.data.background_images):
+                col = flow.column(align=True)
+
+                icon = get_background_icon(bg)
+                if icon:
+                    col.template_icon(icon_value=icon, scale=5)
+                else:
+                    col.label(text="", icon='IMAGE_BACKGROUND')
+
+                row = col.row(align=True)
+                row.prop(bg, "show_background_image", text="")
+                for transform, _name, transform_icon in TRANSFORMS:
+                    op = row.operator(CAMERA_OT_background_browse.bl_idname, text="", icon=transform_icon)
+                    op.camera = cam.name
+                    op.index = i
+                    op.transform = transform
+
+                source = bg.image if bg.source == 'IMAGE' else bg.clip
+                col.label(text=source.name if source else "No Image")
+
+
+classes = (
+    CAMERA_OT_background_browse,
+    VIEW3D_PT_camera_backgrounds,
+)
+
+
+def register():
+    global previews
+    previews = bpy.utils.previews.new()
+
+    from bpy.utils import register_class
+    for cls in classes:
+        register_class(cls)
+
+
+def unregister():
+    global previews
+    from bpy.utils import unregister_class
+    for cls in reversed(classes):
+        unregister_class(cls)
+
+    if bpy.app.timers.is_registered(process_thumbnails):
+        bpy.app.timers.unregister(process_thumbnails)
+    for job in thumbnail_jobs.values():
+        job.cancel()
+    thumbnail_jobs.clear()
+    main_thread_queue.clear()
+    failed_thumbnails.clear()
+    shutdown_executor()
+
+    bpy.utils.previews.remove(previews)
+    previews = None
@@ -5,37 +5,30 @@ from ..package import get_preferences
 addon_keymaps = []
 
 
+def add_modal_keymap_item(keymap_items, name, label, type, tag):
+    if name in keymap_items:
+        return
+
+    kmi = keymap_items.add()
+    kmi.name = name
+    kmi.label = label
+    kmi.type = type
+    kmi.tag = tag
+
+
 def register_modal_keymap():
     modal_keymap = get_preferences().keymaps.get("modal")
     if modal_keymap is None:
         modal_keymap = get_preferences().keymaps.add()
         modal_keymap.name = "modal"
 
-        keymap_items = modal_keymap.keymap_items
-
-        kmi = keymap_items.add()
-        kmi.name = "constraint_x"
-        kmi.label = "Constraint X"
-        kmi.type = 'X'
-        kmi.tag = "Default"
-
-        kmi = keymap_items.add()
-        kmi.name = "constraint_y"
-        kmi.label = "Constraint Y"
-        kmi.type = 'Y'
-        kmi.tag = "Default"
-
-        kmi = keymap_items.add()
-        kmi.name = "flip_x"
-        kmi.label = "Flip Image X"
-        kmi.type = 'H'
-        kmi.tag = "Default"
-
-        kmi = keymap_items.add()
-        kmi.name = "flip_y"
-        kmi.label = "Flip Image Y"
-        kmi.type = 'V'
-        kmi.tag = "Default"
+    # items are added one by one, so keymaps saved by earlier versions get new ones
+    keymap_items = modal_keymap.keymap_items
+    add_modal_keymap_item(keymap_items, "constraint_x", "Constraint X", 'X', "Default")
+    add_modal_keymap_item(keymap_items, "constraint_y", "Constraint Y", 'Y', "Default")
+    add_modal_keymap_item(keymap_items, "flip_x", "Flip Image X", 'H', "Default")
+    add_modal_keymap_item(keymap_items, "flip_y", "Flip Image Y", 'V', "Default")
+    add_modal_keymap_item(keymap_items, "edge_overlay", "Toggle Edge Overlay", 'E', "Default")
 
 
 def register():
@@ -0,0 +1,74 @@
+import bpy
+
+from ..utils.fit import fit_backgrounds_to_render_frame
+
+
+class CAMERA_OT_background_fit(bpy.types.Operator):
+    """Match backgrounds of selected cameras to render frame"""
+
+    bl_idname = "camera.background_fit"
+    bl_label = "Fit Backgrounds to Render Frame"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    method: bpy.props.EnumProperty(
+        name="Method",
+        description="How background image is fitted into render frame",
+        items=(
+            ('CROP', "Fill", "Fill the whole render frame, cropping the image"),
+            ('FIT', "Fit", "Fit the whole image inside render frame"),
+        ),
+        default='CROP',
+    )
+    anchor: bpy.props.EnumProperty(
+        name="Center",
+        description="Point background image is centered on",
+        items=(
+            ('FRAME', "Frame", "Center of render frame"),
+            ('OPTICAL_CENTER', "Lens Axis", "Center of unshifted camera view, compensating camera shift"),
+        ),
+        default='FRAME',
+    )
+    only_visible: bpy.props.BoolProperty(
+        name="Only Visible",
+        description="Skip hidden backgrounds",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return any(ob.type == 'CAMERA' for ob in context.selected_objects)
+
+    def execute(self, context):
+        cameras = [ob for ob in context.selected_objects if ob.type == 'CAMERA']
+        count = fit_backgrounds_to_render_frame(cameras, context.scene, method=self.method, anchor=self.anchor,
+                                                only_visible=self.only_visible)
+        if not count:
+            self.report({'WARNING'}, "No backgrounds with images")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Fitted {count} backgrounds")
+        return {'FINISHED'}
+
+
+def draw_menu(self, _context):
+    self.layout.separator()
+    self.layout.operator(CAMERA_OT_background_fit.bl_idname)
+
+
+classes = (
+    CAMERA_OT_background_fit,
+)
+
+
+def register():
+    from bpy.utils import register_class
+    for cls in classes:
+        register_class(cls)
+    bpy.types.VIEW3D_MT_view_cameras.append(draw_menu)
+
+
+def unregister():
+    bpy.types.VIEW3D_MT_view_cameras.remove(draw_menu)
+    from bpy.utils import unregister_class
+    for cls in reversed(classes):
+        unregister_class(cls)
@@ -9,8 +9,15 @@ from gpu_extras.batch import batch_for_shader
 from mathutils import Matrix, Vector
 
 from ...package import get_preferences
+from ..overlay import EdgeOverlay
+from ..playback import keep_background_edit
 from ..properties import ModalKeyMapItem
 from ..utils.modal import event_match_kmi
+from ..utils.modal import is_snapping
+from ..utils.transform import BackgroundState
+from ..utils.transform import MoveDrag
+from ..utils.transform import read_background_state
+from ..utils.transform import write_background_state
 
 shader = gpu.shader.from_builtin('UNIFORM_COLOR')
 
@@ -32,6 +39,14 @@ class CAMERA_OT_background_move(bpy.types.Operator):
         options={'SKIP_SAVE'},
     )
 
+    index: bpy.props.IntProperty(
+        name="Index",
+        description="Index of background to transform, the first visible one is used when negative",
+        default=-1,
+        min=-1,
+        options={'SKIP_SAVE', 'HIDDEN'},
+    )
+
     @classmethod
     def poll(cls, context):
         ob = context.object
@@ -47,20 +62,19 @@ class CAMERA_OT_background_move(bpy.types.Operator):
         self.last_mouse_x: int = 0
         self.last_mouse_y: int = 0
 
-        self.bg_offset_x_float: float = 0
-        self.bg_offset_y_float: float = 0
+        self.state: Optional[BackgroundState] = None
+        self.init_state: Optional[BackgroundState] = None
+        self.drag: Optional[MoveDrag] = None
 
-        self.init_bg_offset_x: int = 0
-        self.init_bg_offset_y: int = 0
-        self.init_bg_flip_x: bool = False
-        self.init_bg_flip_y: bool = False
+        self.edge_overlay: Optional[EdgeOverlay] = None
 
         self.handler: object = None
         self.batch: Optional[GPUBatch] = None
 
     def invoke(self, context, event):
         self.cam = context.object
-        cam_backgrounds = [bg for bg in self.cam.data.background_images if bg.image and bg.show_background_image]
+        cam_backgrounds = [bg for i, bg in enumerate(self.cam.data.background_images)
+                           if bg.image and bg.show_background_image and self.index in (-1, i)]
         if not any(cam_backgrounds):
             self.report({'WARNING'}, "No visible backgrounds")
             return {'CANCELLED'}
@@ -69,10 +83,13 @@ class CAMERA_OT_background_move(bpy.types.Operator):
         self.last_mouse_x = event.mouse_region_x
         self.last_mouse_y = event.mouse_region_y
 
-        self.init_bg_offset_x = self.bg_offset_x_float = self.bg.offset[0]
-        self.init_bg_offset_y = self.bg_offset_y_float = self.bg.offset[1]
-        self.init_bg_flip_x = self.bg.use_flip_x
-        self.init_bg_flip_y = self.bg.use_flip_y
+        self.state = read_background_state(self.bg)
+        self.init_state = self.state.copy()
+        self.drag = MoveDrag(self.state)
+
+        self.edge_overlay = EdgeOverlay(self.cam, self.bg)
+        if get_preferences().use_edge_overlay:
+            self.edge_overlay.show(context)
 
         self.redraw_status(context)
         context.window.cursor_modal_set('HAND')
@@ -86,6 +103,7 @@ class CAMERA_OT_background_move(bpy.types.Operator):
         """Draw shortcuts in the status."""
         flip_x_key = self.keymap_items["flip_x"].type
         flip_y_key = self.keymap_items["flip_y"].type
+        edge_overlay_key = self.keymap_items["edge_overlay"].type
         constraint_x_key = self.keymap_items["constraint_x"].type
         constraint_y_key = self.keymap_items["constraint_y"].type
 
@@ -95,37 +113,19 @@ class CAMERA_OT_background_move(bpy.types.Operator):
             f"{flip_x_key}: Flip Horizontally | "
             f"{flip_y_key}: Flip Vertically | "
             f"{constraint_x_key}: Constraint Horizontal | "
-            f"{constraint_y_key}: Constraint Vertical"
+            f"{constraint_y_key}: Constraint Vertical | "
+            f"{edge_overlay_key}: Edge Overlay"
         )
         context.workspace.status_text_set(status_text)
 
     def modal(self, context, event):
 
         if event.type == 'MOUSEMOVE':
-            mouse_x = event.mouse_region_x
-            mouse_y = event.mouse_region_y
-            mouse_offset_x = mouse_x - self.last_mouse_x
-            mouse_offset_y = mouse_y - self.last_mouse_y
-
-            divisor = 6000 if event.shift else 600
-            move_offset_x = mouse_offset_x / divisor if not self.constraint_axis[0] else 0
-            move_offset_y = mouse_offset_y / divisor if not self.constraint_axis[1] else 0
-            self.bg_offset_x_float += move_offset_x
-            self.bg_offset_y_float += move_offset_y
-
-            if event.ctrl or (context.scene.tool_settings.use_snap
-                              and context.scene.tool_settings.use_snap_scale
-                              and context.scene.tool_settings.snap_elements == 'INCREMENT'
-                              and not event.ctrl):
-                rounded_x = round(self.bg_offset_x_float / .01) * .01
-                rounded_y = round(self.bg_offset_y_float / .01) * .01
-                if self.bg.offset[0] != rounded_x:
-                    self.bg.offset[0] = rounded_x
-                if self.bg.offset[1] != rounded_y:
-                    self.bg.offset[1] = rounded_y
-            else:
-                self.bg.offset[0] = self.bg_offset_x_float
-                self.bg.offset[1] = self.bg_offset_y_float
+            mouse_offset_x = event.mouse_region_x - self.last_mouse_x
+            mouse_offset_y = event.mouse_region_y - self.last_mouse_y
+            self.drag.drag(mouse_offset_x, mouse_offset_y, fine=event.shift, snap=is_snapping(context, event),
+                           constraint_axis=tuple(self.constraint_axis))
+            write_background_state(self.bg, self.state)
 
             context.area.header_text_set(f"Background Offset: {self.bg.offset[0]:.4f}, {self.bg.offset[1]:.4f}")
 
@@ -159,10 +159,15 @@ class CAMERA_OT_background_move(bpy.types.Operator):
                 context.region.tag_redraw()
 
             elif event_match_kmi(self, event, "flip_x"):
-                self.bg.use_flip_x = not self.bg.use_flip_x
+                self.state.toggle_flip_x()
+                write_background_state(self.bg, self.state)
 
             elif event_match_kmi(self, event, "flip_y"):
-                self.bg.use_flip_y = not self.bg.use_flip_y
+                self.state.toggle_flip_y()
+                write_background_state(self.bg, self.state)
+
+            elif event_match_kmi(self, event, "edge_overlay"):
+                self.edge_overlay.toggle(context)
 
             elif event.type in ('ESC', 'RIGHTMOUSE'):
                 self.undo_changes()
@@ -171,21 +176,21 @@ class CAMERA_OT_background_move(bpy.types.Operator):
 
             elif event.type in ('SPACE', 'LEFTMOUSE'):
                 self.finish_modal(context)
+                if not keep_background_edit(context.scene, self.cam.data, self.bg):
+                    self.report({'WARNING'}, "Background is animated, key it to keep the edit after frame change")
                 return {'FINISHED'}
 
         return {'RUNNING_MODAL'}
 
     def undo_changes(self):
-        self.bg.offset[0] = self.init_bg_offset_x
-        self.bg.offset[1] = self.init_bg_offset_y
-        self.bg.use_flip_x = self.init_bg_flip_x
-        self.bg.use_flip_y = self.init_bg_flip_y
+        write_background_state(self.bg, self.init_state)
 
     def finish_modal(self, context):
         context.area.header_text_set(text=None)
         context.workspace.status_text_set(text=None)
         context.space_data.draw_handler_remove(self.handler, 'WINDOW')
         context.window.cursor_modal_restore()
+        self.edge_overlay.hide(context)
 
     def build_shader_batch(self):
 
@@ -5,8 +5,15 @@ from bpy.types import CameraBackgroundImage
 from bpy.types import Object
 
 from ...package import get_preferences
+from ..overlay import EdgeOverlay
+from ..playback import keep_background_edit
 from ..properties import ModalKeyMapItem
 from ..utils.modal import event_match_kmi
+from ..utils.modal import is_snapping
+from ..utils.transform import BackgroundState
+from ..utils.transform import ScaleDrag
+from ..utils.transform import read_background_state
+from ..utils.transform import write_background_state
 
 
 class CAMERA_OT_background_scale(bpy.types.Operator):
@@ -16,6 +23,14 @@ class CAMERA_OT_background_scale(bpy.types.Operator):
     bl_label = "Scale Camera Background"
     bl_options = {'REGISTER', 'UNDO', 'GRAB_CURSOR', 'BLOCKING'}
 
+    index: bpy.props.IntProperty(
+        name="Index",
+        description="Index of background to transform, the first visible one is used when negative",
+        default=-1,
+        min=-1,
+        options={'SKIP_SAVE', 'HIDDEN'},
+    )
+
     @classmethod
     def poll(cls, context):
         ob = context.object
@@ -30,17 +45,16 @@ class CAMERA_OT_background_scale(bpy.types.Operator):
 
         self.last_mouse_x: int = 0
 
-        self.bg_scale_float: float = 0
+        self.state: Optional[BackgroundState] = None
+        self.init_state: Optional[BackgroundState] = None
+        self.drag: Optional[ScaleDrag] = None
 
-        self.init_bg_scale: float = 0
-        self.init_bg_offset_x: int = 0
-        self.init_bg_offset_y: int = 0
-        self.init_bg_flip_x: bool = False
-        self.init_bg_flip_y: bool = False
+        self.edge_overlay: Optional[EdgeOverlay] = None
 
     def invoke(self, context, event):
         self.cam = context.object
-        cam_backgrounds = [bg for bg in self.cam.data.background_images if bg.image and bg.show_background_image]
+        cam_backgrounds = [bg for i, bg in enumerate(self.cam.data.background_images)
+                           if bg.image and bg.show_background_image and self.index in (-1, i)]
         if not any(cam_backgrounds):
             self.report({'WARNING'}, "No visible backgrounds")
             return {'CANCELLED'}
@@ -48,11 +62,13 @@ class CAMERA_OT_background_scale(bpy.types.Operator):
         self.bg = cam_backgrounds[0]
         self.last_mouse_x = event.mouse_region_x
 
-        self.init_bg_scale = self.bg_scale_float = self.bg.scale
-        self.init_bg_offset_x = self.bg.offset[0]
-        self.init_bg_offset_y = self.bg.offset[1]
-        self.init_bg_flip_x = self.bg.use_flip_x
-        self.init_bg_flip_y = self.bg.use_flip_y
+        self.state = read_background_state(self.bg)
+        self.init_state = self.state.copy()
+        self.drag = ScaleDrag(self.state)
+
+        self.edge_overlay = EdgeOverlay(self.cam, self.bg)
+        if get_preferences().use_edge_overlay:
+            self.edge_overlay.show(context)
 
         self.redraw_status(context)
         context.window.cursor_modal_set('MOVE_X')
@@ -64,36 +80,23 @@ class CAMERA_OT_background_scale(bpy.types.Operator):
         """Draw shortcuts in the status."""
         flip_x_key = self.keymap_items["flip_x"].type
         flip_y_key = self.keymap_items["flip_y"].type
+        edge_overlay_key = self.keymap_items["edge_overlay"].type
 
         status_text = (
             f"LMB, ENTER: Confirm | "
             f"RMB, ESC: Cancel | "
             f"{flip_x_key}: Flip Horizontally | "
-            f"{flip_y_key}: Flip Vertically"
+            f"{flip_y_key}: Flip Vertically | "
+            f"{edge_overlay_key}: Edge Overlay"
         )
         context.workspace.status_text_set(status_text)
 
     def modal(self, context, event):
 
         if event.type == 'MOUSEMOVE':
-            mouse_x = event.mouse_region_x
-            mouse_offset_x = mouse_x - self.last_mouse_x
-
-            divisor = 3000 if event.shift else 300
-            offset = mouse_offset_x / divisor
-            self.bg_scale_float += offset
-
-            if event.ctrl or (context.scene.tool_settings.use_snap
-                              and context.scene.tool_settings.use_snap_scale
-                              and context.scene.tool_settings.snap_elements == 'INCREMENT'
-                              and not event.ctrl):
-                rounded = round(self.bg_scale_float / .1) * .1
-                if self.bg.scale != rounded:
-                    new_scale = max(rounded, 0.01)
-                    self.bg.scale = new_scale
-            else:
-                new_scale = max(self.bg_scale_float, 0.01)
-                self.bg.scale = new_scale
+            mouse_offset_x = event.mouse_region_x - self.last_mouse_x
+            self.drag.drag(mouse_offset_x, fine=event.shift, snap=is_snapping(context, event))
+            write_background_state(self.bg, self.state)
 
             context.area.header_text_set(f"Background Scale: {self.bg.scale:.3f}")
 
@@ -101,10 +104,15 @@ class CAMERA_OT_background_scale(bpy.types.Operator):
 
         if event.value == 'PRESS':
             if event_match_kmi(self, event, "flip_x"):
-                self.bg.use_flip_x = not self.bg.use_flip_x
+                self.state.toggle_flip_x()
+                write_background_state(self.bg, self.state)
 
             elif event_match_kmi(self, event, "flip_y"):
-                self.bg.use_flip_y = not self.bg.use_flip_y
+                self.state.toggle_flip_y()
+                write_background_state(self.bg, self.state)
+
+            elif event_match_kmi(self, event, "edge_overlay"):
+                self.edge_overlay.toggle(context)
 
             elif event.type in ('ESC', 'RIGHTMOUSE'):
                 self.undo_changes()
@@ -113,22 +121,20 @@ class CAMERA_OT_background_scale(bpy.types.Operator):
 
             elif event.type in ('SPACE', 'LEFTMOUSE'):
                 self.finish_modal(context)
+                if not keep_background_edit(context.scene, self.cam.data, self.bg):
+                    self.report({'WARNING'}, "Background is animated, key it to keep the edit after frame change")
                 return {'FINISHED'}
 
         return {'RUNNING_MODAL'}
 
     def undo_changes(self):
-        self.bg.scale = self.init_bg_scale
-        self.bg.offset[0] = self.init_bg_offset_x
-        self.bg.offset[1] = self.init_bg_offset_y
-        self.bg.use_flip_x = self.init_bg_flip_x
-        self.bg.use_flip_y = self.init_bg_flip_y
-
-    @staticmethod
-    def finish_modal(context):
+        write_background_state(self.bg, self.init_state)
+
+    def finish_modal(self, context):
         context.area.header_text_set(text=None)
         context.workspace.status_text_set(text=None)
         context.window.cursor_modal_restore()
+        self.edge_overlay.hide(context)
 
 
 classes = (
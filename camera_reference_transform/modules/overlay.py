@@ -0,0 +1,178 @@
+from typing import Optional
+
+import bpy
+import gpu
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import CameraBackgroundImage
+from bpy.types import Image
+from bpy.types import Object
+from gpu.types import GPUTexture
+from gpu_extras.batch import batch_for_shader
+
+from ..package import get_preferences
+from .utils.edges import build_pyramid_level
+from .utils.edges import get_edge_map
+from .utils.edges import get_luminance
+from .utils.edges import get_pyramid_level
+from .utils.geometry import get_background_corners
+from .utils.geometry import get_background_uvs
+from .utils.view import get_camera_frame_rect
+from .utils.view import get_view_camera
+
+shader = gpu.shader.from_builtin('IMAGE_COLOR')
+
+# (image name, pyramid level, edge method) -> (image signature, texture)
+edge_textures: dict[tuple[str, int, str], tuple[tuple, GPUTexture]] = {}
+
+
+def get_image_signature(image: Image) -> tuple:
+    """Return values that change when image has to be read again."""
+    return image.filepath_raw, image.source, tuple(image.size)
+
+
+def read_image_pixels(image: Image) -> np.ndarray:
+    """Return image pixels as array shaped (height, width, channels)."""
+    width, height = image.size
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, image.channels)
+
+
+def create_edge_texture(edges: np.ndarray) -> GPUTexture:
+    """Upload edge map as white texture with edge strength in alpha."""
+    height, width = edges.shape
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    rgba[..., 3] = edges
+    buffer = gpu.types.Buffer('FLOAT', rgba.size, rgba.ravel())
+    return gpu.types.GPUTexture((width, height), format='RGBA16F', data=buffer)
+
+
+def get_edge_texture(image: Image) -> Optional[GPUTexture]:
+    """Return cached edge texture of the image, computing it if the image has changed."""
+    width, height = image.size
+    if not width or not height:
+        return None
+
+    prefs = get_preferences()
+    level = get_pyramid_level((width, height), prefs.edge_overlay_max_size)
+    key = (image.name_full, level, prefs.edge_overlay_method)
+    signature = get_image_signature(image)
+
+    cached = edge_textures.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    luminance = build_pyramid_level(get_luminance(read_image_pixels(image)), level)
+    texture = create_edge_texture(get_edge_map(luminance, prefs.edge_overlay_method))
+    # textures for previous max size or method preferences would never be drawn again
+    invalidate_image(image.name_full)
+    edge_textures[key] = signature, texture
+    return texture
+
+
+def invalidate_image(image_name: str) -> None:
+    """Drop cached edge textures of the image on all pyramid levels."""
+    for key in [key for key in edge_textures if key[0] == image_name]:
+        del edge_textures[key]
+
+
+def draw_edge_overlay(cam: Object, bg: CameraBackgroundImage) -> None:
+    image = bg.image
+    if image is None:
+        return
+
+    texture = get_edge_texture(image)
+    if texture is None:
+        return
+
+    context = bpy.context
+    # the handler is added to all 3D viewports
+    if get_view_camera(context) != cam:
+        return
+
+    frame_rect = get_camera_frame_rect(context, cam)
+    if frame_rect is None:
+        return
+
+    width, height = image.size
+    corners = get_background_corners(frame_rect, width / height, bg.frame_method, cam.data.sensor_fit, bg.offset,
+                                     bg.rotation, bg.scale)
+    uvs = get_background_uvs(bg.use_flip_x, bg.use_flip_y)
+    batch = batch_for_shader(shader, 'TRIS', {"pos": corners, "texCoord": uvs}, indices=((0, 1, 2), (0, 2, 3)))
+
+    gpu.state.blend_set('ALPHA')
+    shader.bind()
+    shader.uniform_float("color", get_preferences().edge_overlay_color)
+    shader.uniform_sampler("image", texture)
+    batch.draw(shader)
+    gpu.state.blend_set('NONE')
+
+
+def add_overlay_handler(context, cam: Object, bg: CameraBackgroundImage) -> object:
+    """Compute edge texture of the background and start drawing it with live background transform."""
+    if bg.source != 'IMAGE' or bg.image is None or get_edge_texture(bg.image) is None:
+        return None
+
+    handler = context.space_data.draw_handler_add(draw_edge_overlay, (cam, bg), 'WINDOW', 'POST_PIXEL')
+    context.area.tag_redraw()
+    return handler
+
+
+def remove_overlay_handler(context, handler: object) -> None:
+    if handler is None:
+        return
+
+    context.space_data.draw_handler_remove(handler, 'WINDOW')
+    context.area.tag_redraw()
+
+
+class EdgeOverlay:
+    """Edge overlay of a modal operator, toggled without changing the preference."""
+
+    __slots__ = ("cam", "bg", "enabled", "handler")
+
+    def __init__(self, cam: Object, bg: CameraBackgroundImage):
+        self.cam = cam
+        self.bg = bg
+        self.enabled = False
+        self.handler: object = None
+
+    def show(self, context) -> None:
+        self.enabled = True
+        if self.handler is None:
+            self.handler = add_overlay_handler(context, self.cam, self.bg)
+
+    def hide(self, context) -> None:
+        self.enabled = False
+        remove_overlay_handler(context, self.handler)
+        self.handler = None
+
+    def toggle(self, context) -> None:
+        if self.enabled:
+            self.hide(context)
+        else:
+            self.show(context)
+
+
+@persistent
+def invalidate_updated_images(_scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, Image):
+            invalidate_image(update.id.name_full)
+
+
+@persistent
+def clear_edge_textures(_):
+    edge_textures.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_updated_images)
+    bpy.app.handlers.load_pre.append(clear_edge_textures)
+
+
+def unregister():
+    bpy.app.handlers.load_pre.remove(clear_edge_textures)
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_updated_images)
+    edge_textures.clear()
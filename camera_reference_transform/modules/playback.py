@@ -0,0 +1,452 @@
+import re
+from typing import Optional
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import Camera
+from bpy.types import CameraBackgroundImage
+from bpy.types import FCurve
+
+CHANNEL_PATTERN = re.compile(r"background_images\[(\d+)\]\.(offset|rotation|scale)$")
+
+# fcurves muted while their values are played from the table, stored in the camera so it survives undo and renames
+MUTED_PROPERTY = "reference_transforms_muted"
+# values are stored in table as float32
+EDIT_TOLERANCE = 1e-6
+# keyframe properties changing the curve between keyframes
+KEYFRAME_ENUMS = ("interpolation", "easing")
+KEYFRAME_FLOATS = ("back", "amplitude", "period")
+# modifier properties that don't change evaluation
+MODIFIER_UI_PROPERTIES = {"rna_type", "name", "show_expanded", "active", "is_valid"}
+
+
+class BakedCamera:
+    """Background transforms of a camera sampled on every frame of the scene range."""
+
+    __slots__ = ("action_name", "frame_range", "signature", "table", "channels", "fcurve_keys")
+
+    def __init__(self,
+                 action_name: str,
+                 frame_range: tuple[int, int],
+                 signature: int,
+                 table: np.ndarray,
+                 channels: dict[str, tuple[np.ndarray, np.ndarray]],
+                 fcurve_keys: list[str]):
+        self.action_name = action_name
+        self.frame_range = frame_range
+        self.signature = signature
+        # frames x fcurves
+        self.table = table
+        # property -> (table columns, indices in flat property array of background collection)
+        self.channels = channels
+        self.fcurve_keys = fcurve_keys
+
+
+# camera name -> baked camera
+baked_cameras: dict[str, BakedCamera] = {}
+dirty_cameras: set[str] = set()
+dirty_actions: set[str] = set()
+
+
+def get_fcurve_key(fcurve: FCurve) -> str:
+    return f"{fcurve.data_path}:{fcurve.array_index}"
+
+
+def get_frame_range(scene) -> tuple[int, int]:
+    if scene.use_preview_range:
+        return scene.frame_preview_start, scene.frame_preview_end
+    return scene.frame_start, scene.frame_end
+
+
+def get_background_fcurves(cam_data: Camera) -> list[tuple[FCurve, str, int]]:
+    """Return fcurves animating background transforms with their property and background index.
+
+    Fcurves muted by user are skipped, the ones muted for baked playback are not.
+    """
+    anim_data = cam_data.animation_data
+    if anim_data is None or anim_data.action is None:
+        return []
+
+    muted_keys = set(cam_data.get(MUTED_PROPERTY, ()))
+    bg_count = len(cam_data.background_images)
+
+    fcurves = []
+    for fcurve in anim_data.action.fcurves:
+        match = CHANNEL_PATTERN.match(fcurve.data_path)
+        if match is None:
+            continue
+        if fcurve.mute and get_fcurve_key(fcurve) not in muted_keys:
+            continue
+        bg_index = int(match.group(1))
+        if bg_index < bg_count:
+            fcurves.append((fcurve, match.group(2), bg_index))
+    return fcurves
+
+
+def get_modifier_settings(modifier) -> tuple:
+    settings = []
+    for prop in modifier.bl_rna.properties:
+        if prop.identifier in MODIFIER_UI_PROPERTIES or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        value = getattr(modifier, prop.identifier)
+        settings.append(tuple(value) if getattr(prop, "is_array", False) else value)
+    return tuple(settings)
+
+
+def get_fcurves_signature(fcurves: list[tuple[FCurve, str, int]]) -> int:
+    """Return hash of everything fcurve evaluation depends on, cheap compared to evaluating fcurves on every frame."""
+    parts = []
+    for fcurve, _prop, _bg_index in fcurves:
+        points = fcurve.keyframe_points
+        count = len(points)
+        coords = np.empty(count * (6 + len(KEYFRAME_FLOATS)), dtype=np.float32)
+        points.foreach_get("co", coords[:count * 2])
+        points.foreach_get("handle_left", coords[count * 2:count * 4])
+        points.foreach_get("handle_right", coords[count * 4:count * 6])
+        for i, name in enumerate(KEYFRAME_FLOATS):
+            points.foreach_get(name, coords[count * (6 + i):count * (7 + i)])
+        modes = np.empty(count * len(KEYFRAME_ENUMS), dtype=np.int32)
+        for i, name in enumerate(KEYFRAME_ENUMS):
+            points.foreach_get(name, modes[count * i:count * (i + 1)])
+
+        modifiers = [get_modifier_settings(modifier) for modifier in fcurve.modifiers]
+        parts.append(f"{get_fcurve_key(fcurve)}:{fcurve.extrapolation}:{modifiers}".encode())
+        parts.append(coords.tobytes())
+        parts.append(modes.tobytes())
+    return hash(b"|".join(parts))
+
+
+def bake_camera(cam_data: Camera,
+                fcurves: list[tuple[FCurve, str, int]],
+                frame_range: tuple[int, int],
+                signature: int) -> BakedCamera:
+    frames = np.arange(frame_range[0], frame_range[1] + 1)
+    table = np.empty((len(frames), len(fcurves)), dtype=np.float32)
+
+    columns = {"offset": [], "rotation": [], "scale": []}
+    targets = {"offset": [], "rotation": [], "scale": []}
+    for column, (fcurve, prop, bg_index) in enumerate(fcurves):
+        evaluate = fcurve.evaluate
+        table[:, column] = [evaluate(frame) for frame in frames]
+
+        columns[prop].append(column)
+        targets[prop].append(bg_index * 2 + fcurve.array_index if prop == "offset" else bg_index)
+
+    channels = {
+        prop: (np.array(columns[prop], dtype=np.intp), np.array(targets[prop], dtype=np.intp))
+        for prop in columns if columns[prop]
+    }
+    fcurve_keys = [get_fcurve_key(fcurve) for fcurve, _prop, _bg_index in fcurves]
+    return BakedCamera(cam_data.animation_data.action.name, frame_range, signature, table, channels, fcurve_keys)
+
+
+def mute_fcurves(cam_data: Camera, fcurve_keys: list[str]) -> None:
+    """Mute baked fcurves so animation system skips them, unmute previously baked ones that are gone."""
+    unmute_fcurves(cam_data, keep=set(fcurve_keys))
+
+    action = cam_data.animation_data.action
+    for key in fcurve_keys:
+        data_path, index = key.rsplit(":", 1)
+        fcurve = action.fcurves.find(data_path, index=int(index))
+        if fcurve is not None and not fcurve.mute:
+            fcurve.mute = True
+    cam_data[MUTED_PROPERTY] = fcurve_keys
+
+
+def unmute_fcurves(cam_data: Camera, keep: Optional[set[str]] = None) -> None:
+    muted_keys = cam_data.get(MUTED_PROPERTY)
+    if muted_keys is None:
+        return
+
+    anim_data = cam_data.animation_data
+    if anim_data is not None and anim_data.action is not None:
+        for key in muted_keys:
+            if keep is not None and key in keep:
+                continue
+            data_path, index = key.rsplit(":", 1)
+            fcurve = anim_data.action.fcurves.find(data_path, index=int(index))
+            if fcurve is not None:
+                fcurve.mute = False
+    del cam_data[MUTED_PROPERTY]
+
+
+def rebake_camera(cam_data: Camera, scene, force: bool = False) -> None:
+    """Bake camera again if its fcurves or scene frame range have changed since the last bake."""
+    fcurves = get_background_fcurves(cam_data)
+    if not fcurves:
+        baked_cameras.pop(cam_data.name, None)
+        unmute_fcurves(cam_data)
+        return
+
+    frame_range = get_frame_range(scene)
+    signature = get_fcurves_signature(fcurves)
+    baked = baked_cameras.get(cam_data.name)
+    if not force and baked is not None and baked.signature == signature and baked.frame_range == frame_range:
+        return
+
+    baked = bake_camera(cam_data, fcurves, frame_range, signature)
+    baked_cameras[cam_data.name] = baked
+    mute_fcurves(cam_data, baked.fcurve_keys)
+
+
+def evaluate_baked_fcurves(cam_data: Camera, baked: BakedCamera, frame: float) -> np.ndarray:
+    """Evaluate fcurves on a frame outside of the table."""
+    action = cam_data.animation_data.action
+    values = np.empty(len(baked.fcurve_keys), dtype=np.float32)
+    for column, key in enumerate(baked.fcurve_keys):
+        data_path, index = key.rsplit(":", 1)
+        values[column] = action.fcurves.find(data_path, index=int(index)).evaluate(frame)
+    return values
+
+
+def get_baked_values(cam_data: Camera, baked: BakedCamera, frame: float) -> np.ndarray:
+    row = int(frame) - baked.frame_range[0]
+    if frame == int(frame) and 0 <= row < len(baked.table):
+        return baked.table[row]
+    return evaluate_baked_fcurves(cam_data, baked, frame)
+
+
+def apply_baked_camera(cam_data: Camera, baked: BakedCamera, frame: float) -> None:
+    values = get_baked_values(cam_data, baked, frame)
+
+    backgrounds = cam_data.background_images
+    for prop, (columns, targets) in baked.channels.items():
+        array = np.empty(len(backgrounds) * (2 if prop == "offset" else 1), dtype=np.float32)
+        backgrounds.foreach_get(prop, array)
+        array[targets] = values[columns]
+        backgrounds.foreach_set(prop, array)
+    # foreach_set doesn't run property updates, and muted fcurves don't tag the camera either
+    cam_data.update_tag()
+
+
+def get_scene_cameras(scene) -> list[Camera]:
+    return list(dict.fromkeys(ob.data for ob in scene.objects if ob.type == 'CAMERA'))
+
+
+def get_baking_camera_names() -> set[str]:
+    """Return names of cameras used by scenes with baked playback."""
+    return {
+        cam_data.name
+        for scene in bpy.data.scenes if scene.reference_baked_playback
+        for cam_data in get_scene_cameras(scene)
+    }
+
+
+def get_baking_scene(cam_data: Camera):
+    """Return scene with baked playback that the camera is baked for."""
+    return next((scene for scene in bpy.data.scenes
+                 if scene.reference_baked_playback and cam_data in get_scene_cameras(scene)), None)
+
+
+def bake_scene(scene) -> None:
+    for cam_data in get_scene_cameras(scene):
+        rebake_camera(cam_data, scene)
+
+
+def release_unused() -> None:
+    """Stop baked playback of cameras no scene with baked playback uses."""
+    names = get_baking_camera_names()
+    for cam_data in bpy.data.cameras:
+        if cam_data.name not in names:
+            baked_cameras.pop(cam_data.name, None)
+            unmute_fcurves(cam_data)
+
+
+def release_all() -> None:
+    for cam_data in bpy.data.cameras:
+        unmute_fcurves(cam_data)
+    baked_cameras.clear()
+    dirty_cameras.clear()
+    dirty_actions.clear()
+
+
+def keep_background_edit(scene, cam_data: Camera, bg: CameraBackgroundImage) -> bool:
+    """Key edited background transforms played from the table when auto keying is enabled.
+
+    Baked fcurves are muted, so an unkeyed edit is replaced with the table on the next frame change the same way
+    Blender replaces edits of animated properties. Return False when that is going to happen.
+    """
+    baked = baked_cameras.get(cam_data.name)
+    if baked is None:
+        return True
+
+    bg_index = next(i for i, other in enumerate(cam_data.background_images) if other == bg)
+    frame = scene.frame_current + scene.frame_subframe
+    values = get_baked_values(cam_data, baked, frame)
+
+    changed = []
+    for column, key in enumerate(baked.fcurve_keys):
+        data_path, index = key.rsplit(":", 1)
+        if int(CHANNEL_PATTERN.match(data_path).group(1)) != bg_index:
+            continue
+        value = cam_data.path_resolve(data_path)
+        if not isinstance(value, float):
+            value = value[int(index)]
+        if abs(value - values[column]) > EDIT_TOLERANCE:
+            changed.append((data_path, int(index)))
+
+    if not changed:
+        return True
+    if not scene.tool_settings.use_keyframe_insert_auto:
+        return False
+
+    for data_path, index in changed:
+        cam_data.keyframe_insert(data_path, index=index, frame=frame)
+    rebake_camera(cam_data, get_baking_scene(cam_data) or scene)
+    return True
+
+
+def update_baked_playback(self, context):
+    if self.reference_baked_playback:
+        bake_scene(self)
+    else:
+        release_unused()
+
+
+def apply_current_frame() -> None:
+    """Rebake changed actions and apply the current frame without waiting for frame change."""
+    scene = bpy.context.scene
+    if scene is not None:
+        apply_baked_transforms(scene)
+
+
+def rebake_changed_cameras(scene, cameras: list[Camera]) -> None:
+    frame_range = get_frame_range(scene)
+    for cam_data in cameras:
+        name = cam_data.name
+        baked = baked_cameras.get(name)
+        action = cam_data.animation_data.action if cam_data.animation_data else None
+        # action was edited, possibly in a way the signature doesn't cover
+        if action is not None and action.name in dirty_actions:
+            rebake_camera(cam_data, scene, force=True)
+        elif (name in dirty_cameras
+                or baked is None and MUTED_PROPERTY in cam_data
+                or baked is not None and (baked.frame_range != frame_range
+                                          or action is None
+                                          or baked.action_name != action.name)):
+            rebake_camera(cam_data, scene)
+
+    # keep changes of cameras in other scenes for their next frame change
+    dirty_cameras.difference_update(cam_data.name for cam_data in cameras)
+    dirty_actions.difference_update(
+        cam_data.animation_data.action.name
+        for cam_data in cameras if cam_data.animation_data and cam_data.animation_data.action
+    )
+
+
+@persistent
+def apply_baked_transforms(scene, _depsgraph=None):
+    """Apply the table to baked cameras of the scene.
+
+    Cameras can be baked by another scene using them, their fcurves are muted there too, so the table is applied even
+    when the scene itself doesn't use baked playback.
+    """
+    cameras = get_scene_cameras(scene)
+    if scene.reference_baked_playback:
+        rebake_changed_cameras(scene, cameras)
+    else:
+        for cam_data in cameras:
+            baking_scene = get_baking_scene(cam_data) if cam_data.name in baked_cameras else None
+            if baking_scene is not None:
+                rebake_changed_cameras(baking_scene, [cam_data])
+    # drop changes of actions no camera uses
+    dirty_actions.intersection_update(
+        cam_data.animation_data.action.name
+        for cam_data in bpy.data.cameras if cam_data.animation_data and cam_data.animation_data.action
+    )
+
+    frame = scene.frame_current + scene.frame_subframe
+    for cam_data in cameras:
+        baked = baked_cameras.get(cam_data.name)
+        if baked is not None:
+            apply_baked_camera(cam_data, baked, frame)
+
+    # cameras removed from scenes with baked playback
+    for name in baked_cameras.keys() - get_baking_camera_names():
+        cam_data = bpy.data.cameras.get(name)
+        del baked_cameras[name]
+        if cam_data is not None:
+            unmute_fcurves(cam_data)
+
+
+@persistent
+def invalidate_updated_actions(scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Action):
+            dirty_actions.add(update.id.original.name)
+
+    # keyframes of muted fcurves were edited, which doesn't change the background until the table is applied again
+    if (baked_cameras
+            and any(baked.action_name in dirty_actions for baked in baked_cameras.values())
+            and not bpy.app.timers.is_registered(apply_current_frame)):
+        bpy.app.timers.register(apply_current_frame)
+
+
+@persistent
+def invalidate_after_undo(_scene, _depsgraph=None):
+    dirty_cameras.update(baked_cameras)
+
+
+@persistent
+def unmute_before_save(_):
+    for cam_data in bpy.data.cameras:
+        unmute_fcurves(cam_data)
+
+
+@persistent
+def mute_after_save(_):
+    for name, baked in baked_cameras.items():
+        cam_data = bpy.data.cameras.get(name)
+        if cam_data is not None:
+            mute_fcurves(cam_data, baked.fcurve_keys)
+
+
+@persistent
+def bake_after_load(_):
+    baked_cameras.clear()
+    for cam_data in bpy.data.cameras:
+        unmute_fcurves(cam_data)
+
+    for scene in bpy.data.scenes:
+        if scene.reference_baked_playback:
+            bake_scene(scene)
+
+
+def draw_baked_playback(self, context):
+    self.layout.prop(context.scene, "reference_baked_playback")
+
+
+handlers = (
+    ("frame_change_pre", apply_baked_transforms),
+    ("depsgraph_update_post", invalidate_updated_actions),
+    ("undo_post", invalidate_after_undo),
+    ("redo_post", invalidate_after_undo),
+    ("save_pre", unmute_before_save),
+    ("save_post", mute_after_save),
+    ("load_post", bake_after_load),
+)
+
+
+def register():
+    bpy.types.Scene.reference_baked_playback = bpy.props.BoolProperty(
+        name="Baked Background Playback",
+        description="Play animated background transforms of scene cameras from a precomputed table instead of "
+                    "evaluating fcurves. The fcurves are muted while this is on, a file recovered after a crash or "
+                    "opened without the add-on keeps them muted until they are unmuted in the Graph Editor",
+        default=False,
+        update=update_baked_playback,
+    )
+    for handler_type, handler in handlers:
+        getattr(bpy.app.handlers, handler_type).append(handler)
+    bpy.types.DATA_PT_camera_background_image.append(draw_baked_playback)
+
+
+def unregister():
+    bpy.types.DATA_PT_camera_background_image.remove(draw_baked_playback)
+    for handler_type, handler in reversed(handlers):
+        getattr(bpy.app.handlers, handler_type).remove(handler)
+    if bpy.app.timers.is_registered(apply_current_frame):
+        bpy.app.timers.unregister(apply_current_frame)
+    release_all()
+    del bpy.types.Scene.reference_baked_playback
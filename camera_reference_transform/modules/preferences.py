@@ -3,6 +3,9 @@ import rna_keymap_ui
 
 from .keymaps import addon_keymaps
 from .properties import AddonKeyMap
+from . import remote
+from .remote import update_remote_address
+from .remote import update_remote_control
 from ..package import get_addon_name
 
 
@@ -11,6 +14,71 @@ class ModalBackgroundTransform(bpy.types.AddonPreferences):
 
     keymaps: bpy.props.CollectionProperty(type=AddonKeyMap)
 
+    use_edge_overlay: bpy.props.BoolProperty(
+        name="Edge Overlay",
+        description="Draw edges of the background image over the viewport while transforming it",
+        default=False,
+    )
+    edge_overlay_method: bpy.props.EnumProperty(
+        name="Edge Detection",
+        description="Method used to extract edges of the background image",
+        items=(
+            ('SOBEL', "Sobel", "Soft gradient magnitude"),
+            ('CANNY', "Thin", "Thin edges with weak ones removed"),
+        ),
+        default='SOBEL',
+    )
+    edge_overlay_max_size: bpy.props.IntProperty(
+        name="Overlay Resolution",
+        description="Edges are extracted from the first downsampled image level fitting this size",
+        default=1024,
+        min=64,
+        max=8192,
+    )
+    # noinspection PyTypeChecker
+    edge_overlay_color: bpy.props.FloatVectorProperty(
+        name="Overlay Color",
+        subtype='COLOR_GAMMA',
+        size=4,
+        min=0,
+        max=1,
+        default=(0, 1, 1, 1),
+    )
+
+    cache_directory: bpy.props.StringProperty(
+        name="Cache Directory",
+        description="Directory for decoded image tiles, system temporary directory is used when empty",
+        subtype='DIR_PATH',
+    )
+    stream_workers: bpy.props.IntProperty(
+        name="Decoding Threads",
+        description="Number of threads decoding tiles of streamed backgrounds and thumbnails",
+        default=4,
+        min=1,
+        max=32,
+    )
+
+    use_remote_control: bpy.props.BoolProperty(
+        name="Remote Control",
+        description="Accept background transform edits from other applications through a local socket",
+        default=False,
+        update=update_remote_control,
+    )
+    remote_port: bpy.props.IntProperty(
+        name="Port",
+        description="Localhost TCP port of remote control server",
+        default=8765,
+        min=1024,
+        max=65535,
+        update=update_remote_address,
+    )
+    remote_socket_path: bpy.props.StringProperty(
+        name="Unix Socket",
+        description="Listen on Unix domain socket at this path instead of TCP port",
+        subtype='FILE_PATH',
+        update=update_remote_address,
+    )
+
     def draw(self, context):
         layout = self.layout
 
@@ -35,6 +103,37 @@ class ModalBackgroundTransform(bpy.types.AddonPreferences):
         col.separator()
         self.draw_modal_keymap_items(keymap_items=keymap_items, tag="Reset", column=col)
 
+        box = layout.box()
+        col = box.column()
+        col.label(text="Edge Overlay:")
+        col.use_property_split = True
+        col.use_property_decorate = False
+        col.prop(self, "use_edge_overlay", text="Show by Default")
+        col.prop(self, "edge_overlay_method")
+        col.prop(self, "edge_overlay_max_size")
+        col.prop(self, "edge_overlay_color")
+
+        box = layout.box()
+        col = box.column()
+        col.label(text="Image Cache:")
+        col.use_property_split = True
+        col.use_property_decorate = False
+        col.prop(self, "cache_directory")
+        col.prop(self, "stream_workers")
+
+        box = layout.box()
+        col = box.column()
+        col.label(text="Remote Control:")
+        col.use_property_split = True
+        col.use_property_decorate = False
+        col.prop(self, "use_remote_control")
+        sub = col.column()
+        sub.active = self.use_remote_control
+        sub.prop(self, "remote_port")
+        sub.prop(self, "remote_socket_path")
+        if remote.server_error:
+            col.label(text=remote.server_error, icon='ERROR')
+
     @staticmethod
     def draw_keymap_items(col, km_name, keymap, allow_remove):
         kc = bpy.context.window_manager.keyconfigs.user
@@ -0,0 +1,117 @@
+from typing import Optional
+
+import bpy
+
+from ..package import get_preferences
+from .playback import keep_background_edit
+from .utils.remote import PendingEdit
+from .utils.remote import RemoteServer
+from .utils.transform import read_background_state
+from .utils.transform import write_background_state
+
+APPLY_INTERVAL = 0.02
+
+server: Optional[RemoteServer] = None
+# why the server couldn't be started, shown in preferences
+server_error: str = ""
+
+
+def apply_remote_messages() -> Optional[float]:
+    """Apply all queued messages, coalescing edits of the same background."""
+    if server is None:
+        return None
+
+    messages = server.drain()
+    if not messages:
+        return APPLY_INTERVAL
+
+    # (camera name, background index) -> edit, messages that touched it
+    edits: dict[tuple[str, int], tuple[PendingEdit, list[int]]] = {}
+    for i, message in enumerate(messages):
+        for camera, index, mode, fields in message.ops:
+            edit, message_indices = edits.setdefault((camera, index), (PendingEdit(), []))
+            edit.merge(mode, fields)
+            message_indices.append(i)
+
+    errors = [[] for _ in messages]
+    failed = [0] * len(messages)
+    for (camera, index), (edit, message_indices) in edits.items():
+        cam = bpy.data.objects.get(camera)
+        if cam is None or cam.type != 'CAMERA':
+            error = f"Camera {camera} not found"
+        elif index >= len(cam.data.background_images):
+            error = f"Camera {camera} has no background {index}"
+        else:
+            bg = cam.data.background_images[index]
+            state = read_background_state(bg)
+            edit.apply(state)
+            write_background_state(bg, state)
+            # unkeyed edits of animated backgrounds last until frame change, the same as in Blender
+            keep_background_edit(bpy.context.scene, cam.data, bg)
+            continue
+
+        for i in message_indices:
+            failed[i] += 1
+        for i in set(message_indices):
+            errors[i].append(error)
+
+    for message, message_errors, message_failed in zip(messages, errors, failed):
+        if message.id is not None:
+            server.reply(message, {"id": message.id, "applied": len(message.ops) - message_failed,
+                                   "errors": message_errors})
+    return APPLY_INTERVAL
+
+
+def start_server() -> None:
+    """Start server listening on socket from preferences, raise OSError when it can't be opened."""
+    global server
+    stop_server()
+
+    prefs = get_preferences()
+    new_server = RemoteServer(port=prefs.remote_port, socket_path=bpy.path.abspath(prefs.remote_socket_path))
+    new_server.start()
+    server = new_server
+    bpy.app.timers.register(apply_remote_messages, first_interval=APPLY_INTERVAL, persistent=True)
+
+
+def stop_server() -> None:
+    global server
+    if bpy.app.timers.is_registered(apply_remote_messages):
+        bpy.app.timers.unregister(apply_remote_messages)
+    if server is not None:
+        server.stop()
+        server = None
+
+
+def restart_server(prefs) -> None:
+    """Start server with current preferences, turn remote control off when it can't be started."""
+    global server_error
+    try:
+        start_server()
+    except OSError as e:
+        server_error = f"Can't start server: {e}"
+        prefs.use_remote_control = False
+    else:
+        server_error = ""
+
+
+def update_remote_control(self, _context):
+    if self.use_remote_control:
+        restart_server(self)
+    else:
+        stop_server()
+
+
+def update_remote_address(self, _context):
+    if self.use_remote_control:
+        restart_server(self)
+
+
+def register():
+    prefs = get_preferences()
+    if prefs.use_remote_control:
+        restart_server(prefs)
+
+
+def unregister():
+    stop_server()
@@ -0,0 +1,461 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from math import hypot
+from typing import Optional
+
+import bpy
+import gpu
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import CameraBackgroundImage
+from bpy.types import Image
+from gpu.types import GPUOffScreen
+from gpu.types import GPUTexture
+from gpu_extras.batch import batch_for_shader
+from mathutils import Matrix
+
+from .utils.cache import get_cache_directory
+from .utils.cache import get_file_key
+from .utils.edges import get_pyramid_level
+from .utils.geometry import get_background_corners
+from .utils.geometry import get_background_point
+from .utils.geometry import get_background_uvs
+from .utils.geometry import get_visible_uv_rect
+from .utils.tiles import TiledImage
+from .utils.tiles import read_source_region
+from .utils.tiles import read_source_size
+from .utils.tiles import release_source_buffers
+from .utils.view import get_camera_frame_rect
+from .utils.view import get_view_camera
+from .utils.workers import get_executor
+from .utils.workers import shutdown_executor
+
+# custom property of proxy image holding path to the source
+STREAM_PROPERTY = "reference_stream_source"
+# custom property of proxy image holding opacity of its backgrounds, their own alpha is kept at 0 so that Blender
+# doesn't draw the proxy under the tiles
+ALPHA_PROPERTY = "reference_stream_alpha"
+PROXY_SIZE = 1024
+MAX_TILE_TEXTURES = 128
+MAX_UPLOADS_PER_DRAW = 4
+# depth of streamed backgrounds in normalized device coordinates, just in front of the far plane so they are not clipped
+FAR_DEPTH = 0.999999
+
+shader = gpu.shader.from_builtin('IMAGE_COLOR')
+
+draw_handler: object = None
+
+# source path -> tiled image
+tiled_images: dict[str, TiledImage] = {}
+# (source path, level, tile x, tile y) -> texture, least recently drawn first
+tile_textures: OrderedDict[tuple[str, int, int, int], GPUTexture] = OrderedDict()
+tile_jobs: dict[tuple[str, int, int, int], Future] = {}
+failed_tiles: set[tuple[str, int, int, int]] = set()
+# source path -> texture of proxy image
+proxy_textures: dict[str, GPUTexture] = {}
+# streamed backgrounds are drawn opaque here, then blended into the viewport at their alpha
+offscreen: Optional[GPUOffScreen] = None
+# proxy image name -> job reading its pixels
+proxy_jobs: dict[str, Future] = {}
+
+
+def load_image_pixels(path: str) -> np.ndarray:
+    """Decode the whole image with Blender, used when OpenImageIO is not available."""
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return (np.clip(pixels, 0, 1) * 255 + 0.5).astype(np.uint8).reshape(height, width, 4)
+
+
+def open_tiled_image(path: str, decode: bool = True) -> Optional[TiledImage]:
+    """Return tiled cache of the image file.
+
+    Without OpenImageIO the source can only be decoded at once on the main thread, which happens only when
+    decode is enabled and the cache is not filled yet.
+    """
+    tiled = tiled_images.get(path)
+    if tiled is not None:
+        return tiled
+    if not os.path.isfile(path):
+        return None
+
+    directory = get_cache_directory("tiles", get_file_key(path))
+    size = read_source_size(path)
+    if size is not None:
+        tiled = TiledImage(directory, *size, reader=partial(read_source_region, path))
+    else:
+        tiled = TiledImage.load(directory)
+        if tiled is None or not tiled.is_level_ready(0):
+            if not decode:
+                return None
+            pixels = load_image_pixels(path)
+            tiled = TiledImage(directory, pixels.shape[1], pixels.shape[0])
+            tiled.write_level(0, pixels)
+
+    tiled_images[path] = tiled
+    return tiled
+
+
+def get_proxy_level(tiled: TiledImage) -> int:
+    return min(get_pyramid_level((tiled.width, tiled.height), PROXY_SIZE), tiled.max_level)
+
+
+def create_proxy_image(path: str, tiled: TiledImage) -> Image:
+    """Create low resolution image drawn under streamed tiles, filled once its level is decoded."""
+    level = get_proxy_level(tiled)
+    width, height = tiled.sizes[level]
+    image = bpy.data.images.new(f"{os.path.basename(path)} (Stream)", width, height, alpha=True)
+    image[STREAM_PROPERTY] = path
+    proxy_jobs[image.name] = get_executor().submit(tiled.read_level, level)
+    register_job_timer()
+    return image
+
+
+def fill_proxy_image(image: Image, pixels: np.ndarray) -> None:
+    image.pixels.foreach_set((pixels.astype(np.float32) / 255).ravel())
+    image.pack()
+    image.update()
+    proxy_textures.pop(image[STREAM_PROPERTY], None)
+
+
+def take_background_alpha(bg: CameraBackgroundImage) -> None:
+    """Move alpha of streamed background to its proxy image, so that only the add-on draws it."""
+    bg.image[ALPHA_PROPERTY] = bg.alpha
+    bg.image.id_properties_ui(ALPHA_PROPERTY).update(min=0.0, max=1.0, description="Opacity of streamed background")
+    bg.alpha = 0.0
+
+
+def create_texture(pixels: np.ndarray, width: int, height: int) -> GPUTexture:
+    buffer = gpu.types.Buffer('FLOAT', pixels.size, pixels)
+    return gpu.types.GPUTexture((width, height), format='RGBA16F', data=buffer)
+
+
+def get_proxy_texture(path: str, image: Image) -> GPUTexture:
+    """Return texture of proxy image holding the same values as tiles, not converted by color management."""
+    texture = proxy_textures.get(path)
+    if texture is None:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        texture = proxy_textures[path] = create_texture(pixels, width, height)
+    return texture
+
+
+def get_offscreen(width: int, height: int) -> GPUOffScreen:
+    global offscreen
+    if offscreen is None or (offscreen.width, offscreen.height) != (width, height):
+        if offscreen is not None:
+            offscreen.free()
+        offscreen = GPUOffScreen(width, height, format='RGBA16F')
+    return offscreen
+
+
+def request_tile(key: tuple[str, int, int, int], tiled: TiledImage) -> None:
+    if key in tile_jobs or key in failed_tiles:
+        return
+    tile_jobs[key] = get_executor().submit(tiled.decode_tile, *key[1:])
+    register_job_timer()
+
+
+def get_tile_texture(key: tuple[str, int, int, int], tiled: TiledImage, uploads: list) -> Optional[GPUTexture]:
+    """Return texture of decoded tile, None if the tile is not ready yet or upload budget of the redraw is spent."""
+    texture = tile_textures.get(key)
+    if texture is not None:
+        tile_textures.move_to_end(key)
+        return texture
+
+    if not tiled.is_tile_ready(*key[1:]):
+        request_tile(key, tiled)
+        return None
+    if len(uploads) >= MAX_UPLOADS_PER_DRAW:
+        return None
+
+    pixels = tiled.get_tile(*key[1:])
+    height, width = pixels.shape[:2]
+    texture = tile_textures[key] = create_texture((pixels.astype(np.float32) / 255).ravel(), width, height)
+    uploads.append(key)
+
+    while len(tile_textures) > MAX_TILE_TEXTURES:
+        tile_textures.popitem(last=False)
+    return texture
+
+
+def draw_image_rect(corners: list[tuple[float, float]],
+                    uv_rect: tuple[float, float, float, float],
+                    bg: CameraBackgroundImage,
+                    texture: GPUTexture) -> None:
+    """Draw texture over part of background image given by unflipped texture coordinates."""
+    u0, v0, u1, v1 = uv_rect
+    if bg.use_flip_x:
+        u0, u1 = 1 - u1, 1 - u0
+    if bg.use_flip_y:
+        v0, v1 = 1 - v1, 1 - v0
+    pos = [get_background_point(corners, u, v) for u, v in ((u0, v0), (u1, v0), (u1, v1), (u0, v1))]
+    uvs = get_background_uvs(bg.use_flip_x, bg.use_flip_y)
+
+    batch = batch_for_shader(shader, 'TRIS', {"pos": pos, "texCoord": uvs}, indices=((0, 1, 2), (0, 2, 3)))
+    shader.uniform_sampler("image", texture)
+    batch.draw(shader)
+
+
+def draw_streamed_background(frame_rect: tuple[float, float, float, float],
+                             sensor_fit: str,
+                             bg: CameraBackgroundImage,
+                             path: str,
+                             tiled: TiledImage,
+                             uploads: list) -> None:
+    """Draw proxy image and visible tiles over it at full opacity."""
+    corners = get_background_corners(frame_rect, tiled.width / tiled.height, bg.frame_method, sensor_fit,
+                                     bg.offset, bg.rotation, bg.scale)
+    shader.uniform_float("color", (1, 1, 1, 1))
+    # like Blender, proxy is drawn also outside of the frame
+    draw_image_rect(corners, (0.0, 0.0, 1.0, 1.0), bg, get_proxy_texture(path, bg.image))
+
+    visible = get_visible_uv_rect(corners, frame_rect)
+    if visible is None:
+        return
+    # proxy is enough when zoomed out
+    image_width = hypot(corners[1][0] - corners[0][0], corners[1][1] - corners[0][1])
+    level = tiled.get_level(tiled.width / image_width)
+    if level >= get_proxy_level(tiled):
+        return
+
+    for tx, ty in tiled.get_tiles_in_uv_rect(level, *visible):
+        texture = get_tile_texture((path, level, tx, ty), tiled, uploads)
+        if texture is not None:
+            draw_image_rect(corners, tiled.get_tile_uv_rect(level, tx, ty), bg, texture)
+
+
+def blend_streamed_background(texture: GPUTexture, width: int, height: int, alpha: float, display_depth: str) -> None:
+    """Blend offscreen drawing of streamed background into the viewport.
+
+    Tiles replace the proxy under them in the offscreen drawing, so alpha below 1 makes the whole background evenly
+    transparent instead of showing the proxy through the tiles.
+    """
+    # like Blender, draw back images only where no geometry was drawn
+    gpu.state.depth_test_set('LESS_EQUAL' if display_depth == 'BACK' else 'NONE')
+    # offscreen colors are premultiplied by blending into transparent black
+    gpu.state.blend_set('ALPHA_PREMULT')
+    shader.bind()
+    shader.uniform_float("color", (alpha, alpha, alpha, alpha))
+    pos = ((0, 0), (width, 0), (width, height), (0, height))
+    uvs = ((0, 0), (1, 0), (1, 1), (0, 1))
+    batch = batch_for_shader(shader, 'TRIS', {"pos": pos, "texCoord": uvs}, indices=((0, 1, 2), (0, 2, 3)))
+    shader.uniform_sampler("image", texture)
+    batch.draw(shader)
+    gpu.state.blend_set('NONE')
+
+
+def get_pixel_projection(width: int, height: int) -> Matrix:
+    """Return projection of region coordinates onto far plane."""
+    return Matrix((
+        (2 / width, 0, 0, -1),
+        (0, 2 / height, 0, -1),
+        (0, 0, 0, FAR_DEPTH),
+        (0, 0, 0, 1),
+    ))
+
+
+def draw_streamed_backgrounds():
+    """Draw streamed backgrounds after the scene, when its depth is still available to hide back images behind geometry."""
+    context = bpy.context
+    cam = get_view_camera(context)
+    if cam is None or not cam.data.show_background_images:
+        return
+
+    depth_test = gpu.state.depth_test_get()
+    depth_mask = gpu.state.depth_mask_get()
+    with gpu.matrix.push_pop(), gpu.matrix.push_pop_projection():
+        gpu.matrix.load_identity()
+        gpu.matrix.load_projection_matrix(get_pixel_projection(context.region.width, context.region.height))
+        gpu.state.depth_mask_set(False)
+        draw_camera_backgrounds(context, cam)
+    gpu.state.depth_test_set(depth_test)
+    gpu.state.depth_mask_set(depth_mask)
+
+
+def draw_camera_backgrounds(context, cam) -> None:
+    frame_rect = None
+    uploads = []
+    width, height = context.region.width, context.region.height
+    for bg in cam.data.background_images:
+        if bg.source != 'IMAGE' or bg.image is None or not bg.show_background_image:
+            continue
+        path = bg.image.get(STREAM_PROPERTY)
+        alpha = bg.image.get(ALPHA_PROPERTY, bg.alpha)
+        if path is None or bg.image.name in proxy_jobs or alpha <= 0:
+            continue
+        tiled = open_tiled_image(path, decode=False)
+        if tiled is None:
+            continue
+
+        frame_rect = frame_rect or get_camera_frame_rect(context, cam)
+        if frame_rect is None:
+            return
+        buffer = get_offscreen(width, height)
+        with buffer.bind():
+            gpu.state.active_framebuffer_get().clear(color=(0.0, 0.0, 0.0, 0.0))
+            gpu.state.depth_test_set('NONE')
+            gpu.state.blend_set('ALPHA')
+            shader.bind()
+            draw_streamed_background(frame_rect, cam.data.sensor_fit, bg, path, tiled, uploads)
+        blend_streamed_background(buffer.texture_color, width, height, alpha, bg.display_depth)
+
+    # draw again to upload the rest of ready tiles
+    if len(uploads) >= MAX_UPLOADS_PER_DRAW:
+        context.area.tag_redraw()
+
+
+def tag_redraw_viewports() -> None:
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+def check_jobs() -> Optional[float]:
+    """Fill decoded proxy images and redraw viewports when tiles are decoded."""
+    finished = False
+    for key, job in list(tile_jobs.items()):
+        if job.done():
+            del tile_jobs[key]
+            if job.exception() is not None:
+                failed_tiles.add(key)
+            finished = True
+
+    for image_name, job in list(proxy_jobs.items()):
+        if job.done():
+            del proxy_jobs[image_name]
+            image = bpy.data.images.get(image_name)
+            if image is not None and job.exception() is None:
+                fill_proxy_image(image, job.result())
+            finished = True
+
+    if finished:
+        tag_redraw_viewports()
+    return 0.1 if tile_jobs or proxy_jobs else None
+
+
+def register_job_timer() -> None:
+    if not bpy.app.timers.is_registered(check_jobs):
+        bpy.app.timers.register(check_jobs, first_interval=0.1)
+
+
+@persistent
+def open_streamed_images(_):
+    """Prepare caches of streamed backgrounds, decoding sources that have no cache on this machine."""
+    for image in bpy.data.images:
+        path = image.get(STREAM_PROPERTY)
+        if path is not None:
+            open_tiled_image(path)
+
+    for cam_data in bpy.data.cameras:
+        for bg in cam_data.background_images:
+            if bg.image is not None and STREAM_PROPERTY in bg.image and bg.alpha > 0:
+                take_background_alpha(bg)
+
+
+def clear_streams() -> None:
+    for job in list(tile_jobs.values()) + list(proxy_jobs.values()):
+        job.cancel()
+    tile_jobs.clear()
+    proxy_jobs.clear()
+    failed_tiles.clear()
+    tile_textures.clear()
+    proxy_textures.clear()
+    for tiled in tiled_images.values():
+        tiled.flush()
+    tiled_images.clear()
+    release_source_buffers()
+
+
+@persistent
+def clear_streams_on_load(_):
+    clear_streams()
+
+
+class CAMERA_OT_background_stream_add(bpy.types.Operator):
+    """Add large image as camera background streamed in tiles visible through the camera frame"""
+
+    bl_idname = "camera.background_stream_add"
+    bl_label = "Add Streamed Background"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH', options={'SKIP_SAVE'})
+    filter_image: bpy.props.BoolProperty(default=True, options={'HIDDEN', 'SKIP_SAVE'})
+    filter_folder: bpy.props.BoolProperty(default=True, options={'HIDDEN', 'SKIP_SAVE'})
+
+    @classmethod
+    def poll(cls, context):
+        ob = context.object
+        return ob and ob.type == 'CAMERA'
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = os.path.abspath(bpy.path.abspath(self.filepath))
+        tiled = open_tiled_image(path)
+        if tiled is None:
+            self.report({'WARNING'}, f"Can't read {path}")
+            return {'CANCELLED'}
+
+        cam_data = context.object.data
+        bg = cam_data.background_images.new()
+        bg.image = create_proxy_image(path, tiled)
+        take_background_alpha(bg)
+        cam_data.show_background_images = True
+        return {'FINISHED'}
+
+
+def draw_menu(self, context):
+    layout = self.layout
+    layout.operator(CAMERA_OT_background_stream_add.bl_idname, icon='IMAGE_BACKGROUND')
+    for bg in context.camera.background_images:
+        if bg.image is not None and ALPHA_PROPERTY in bg.image:
+            layout.prop(bg.image, f'["{ALPHA_PROPERTY}"]', text=bg.image.name, slider=True)
+
+
+classes = (
+    CAMERA_OT_background_stream_add,
+)
+
+
+def register():
+    global draw_handler
+    from bpy.utils import register_class
+    for cls in classes:
+        register_class(cls)
+    bpy.types.DATA_PT_camera_background_image.append(draw_menu)
+
+    draw_handler = bpy.types.SpaceView3D.draw_handler_add(draw_streamed_backgrounds, (), 'WINDOW', 'POST_VIEW')
+    bpy.app.handlers.load_pre.append(clear_streams_on_load)
+    bpy.app.handlers.load_post.append(open_streamed_images)
+
+
+def unregister():
+    global draw_handler, offscreen
+    bpy.app.handlers.load_post.remove(open_streamed_images)
+    bpy.app.handlers.load_pre.remove(clear_streams_on_load)
+    bpy.types.SpaceView3D.draw_handler_remove(draw_handler, 'WINDOW')
+    draw_handler = None
+
+    if bpy.app.timers.is_registered(check_jobs):
+        bpy.app.timers.unregister(check_jobs)
+    clear_streams()
+    shutdown_executor()
+    if offscreen is not None:
+        offscreen.free()
+        offscreen = None
+
+    bpy.types.DATA_PT_camera_background_image.remove(draw_menu)
+    from bpy.utils import unregister_class
+    for cls in reversed(classes):
+        unregister_class(cls)
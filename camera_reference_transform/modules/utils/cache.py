@@ -0,0 +1,25 @@
+import hashlib
+import os
+import tempfile
+
+import bpy
+
+from ...package import get_preferences
+
+
+def get_cache_directory(*parts: str) -> str:
+    """Return existing cache subdirectory, by default in system temporary directory."""
+    directory = bpy.path.abspath(get_preferences().cache_directory)
+    if not directory:
+        directory = os.path.join(tempfile.gettempdir(), "reference_transforms")
+
+    path = os.path.join(directory, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_file_key(path: str) -> str:
+    """Return cache key of the file that changes when the file is modified."""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(key.encode()).hexdigest()
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+def get_luminance(pixels: np.ndarray) -> np.ndarray:
+    """Return luminance of pixels shaped (height, width, channels), premultiplied by alpha."""
+    channels = pixels.shape[-1]
+    if channels >= 3:
+        luminance = pixels[..., :3] @ np.array((0.2126, 0.7152, 0.0722), dtype=np.float32)
+    else:
+        luminance = pixels[..., 0].copy()
+    if channels in (2, 4):
+        luminance *= pixels[..., -1]
+    return luminance
+
+
+def downsample(array: np.ndarray) -> np.ndarray:
+    """Return array halved in both dimensions with a 2x2 box filter."""
+    height, width = array.shape[:2]
+    array = array[:height - height % 2, :width - width % 2]
+    return (array[0::2, 0::2] + array[1::2, 0::2] + array[0::2, 1::2] + array[1::2, 1::2]) * 0.25
+
+
+def get_pyramid_level(size: tuple[int, int], max_size: int) -> int:
+    """Return the first pyramid level at which image of given size fits max size."""
+    width, height = size
+    level = 0
+    while max(width, height) > max_size and min(width, height) > 1:
+        width //= 2
+        height //= 2
+        level += 1
+    return level
+
+
+def build_pyramid_level(array: np.ndarray, level: int) -> np.ndarray:
+    """Return array downsampled to given pyramid level."""
+    for _ in range(level):
+        if min(array.shape[:2]) < 2:
+            break
+        array = downsample(array)
+    return array
+
+
+def get_gradients(luminance: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return horizontal and vertical Sobel gradients of luminance."""
+    p = np.pad(luminance, 1, mode='edge')
+    gx = (p[:-2, 2:] + 2 * p[1:-1, 2:] + p[2:, 2:]) - (p[:-2, :-2] + 2 * p[1:-1, :-2] + p[2:, :-2])
+    gy = (p[2:, :-2] + 2 * p[2:, 1:-1] + p[2:, 2:]) - (p[:-2, :-2] + 2 * p[:-2, 1:-1] + p[:-2, 2:])
+    return gx, gy
+
+
+def suppress_non_maximum(magnitude: np.ndarray, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+    """Return mask of pixels that are local maximums along gradient direction."""
+    angle = np.arctan2(gy, gx)
+    direction = np.round(angle / (np.pi / 4)).astype(np.int8) % 4
+
+    p = np.pad(magnitude, 1)
+    neighbours = (
+        (p[1:-1, :-2], p[1:-1, 2:]),  # horizontal gradient
+        (p[:-2, :-2], p[2:, 2:]),  # diagonal gradient
+        (p[:-2, 1:-1], p[2:, 1:-1]),  # vertical gradient
+        (p[:-2, 2:], p[2:, :-2]),  # anti-diagonal gradient
+    )
+
+    mask = np.zeros(magnitude.shape, dtype=bool)
+    for i, (prev, next_) in enumerate(neighbours):
+        mask |= (direction == i) & (magnitude >= prev) & (magnitude >= next_)
+    return mask
+
+
+def get_edge_map(luminance: np.ndarray, method: str = 'SOBEL') -> np.ndarray:
+    """Return edge strength in 0-1 range.
+
+    SOBEL returns normalized gradient magnitude, CANNY additionally thins edges to one pixel and
+    cuts off weak ones.
+    """
+    gx, gy = get_gradients(luminance)
+    magnitude = np.hypot(gx, gy)
+
+    norm = np.percentile(magnitude, 99)
+    if norm <= 0:
+        return np.zeros(magnitude.shape, dtype=np.float32)
+    edges = np.clip(magnitude / norm, 0, 1)
+
+    if method == 'CANNY':
+        edges *= suppress_non_maximum(magnitude, gx, gy)
+        low, high = 0.1, 0.3
+        edges = np.clip((edges - low) / (high - low), 0, 1)
+
+    return edges.astype(np.float32)
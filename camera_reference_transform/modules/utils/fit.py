@@ -0,0 +1,127 @@
+from typing import Iterable
+from typing import Optional
+
+import numpy as np
+
+from .geometry import get_offset_units
+
+FRAME_METHODS = ('STRETCH', 'FIT', 'CROP')
+
+
+def get_fitted_widths(frame_aspect: np.ndarray, image_aspect: np.ndarray, crop) -> np.ndarray:
+    """Return widths of images fitted into frames of unit height, either filling or fitting inside them."""
+    return np.where((image_aspect > frame_aspect) == crop, image_aspect, frame_aspect)
+
+
+def solve_render_frame_fit(frame_aspect,
+                           image_aspect,
+                           frame_method,
+                           shift_x,
+                           shift_y,
+                           method: str = 'CROP',
+                           anchor: str = 'FRAME') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return background offsets shaped (n, 2), scales and frame methods shaped (n,) matching render frame.
+
+    Frame methods are given as indices into FRAME_METHODS. Method CROP fills the frame with the image, FIT fits the
+    image inside it. Stretched backgrounds can't do either, they get the method as their frame method instead.
+    Anchor FRAME centers the image in the frame, OPTICAL_CENTER centers it on the lens axis, compensating camera
+    shift.
+    """
+    image_aspect = np.asarray(image_aspect, dtype=np.float64)
+    frame_aspect = np.broadcast_to(np.asarray(frame_aspect, dtype=np.float64), image_aspect.shape)
+    frame_method = np.asarray(frame_method)
+    frame_method = np.where(frame_method == FRAME_METHODS.index('STRETCH'), FRAME_METHODS.index(method), frame_method)
+
+    base_width = get_fitted_widths(frame_aspect, image_aspect, frame_method == FRAME_METHODS.index('CROP'))
+    target_width = get_fitted_widths(frame_aspect, image_aspect, method == 'CROP')
+    scale = target_width / base_width
+
+    offset = np.zeros((image_aspect.size, 2))
+    if anchor == 'OPTICAL_CENTER':
+        # shift and offset are both measured in the sensor fit dimension, but offset is aspect corrected
+        unit_x, unit_y = get_offset_units(frame_aspect, image_aspect)
+        offset[:, 0] = -np.asarray(shift_x) / unit_x
+        offset[:, 1] = -np.asarray(shift_y) / unit_y
+
+    return offset, scale, frame_method
+
+
+def get_background_source_size(bg) -> Optional[tuple[int, int]]:
+    """Return pixel size of background image or movie clip."""
+    source = bg.image if bg.source == 'IMAGE' else bg.clip
+    if source is None:
+        return None
+
+    width, height = source.size
+    if not width or not height:
+        return None
+    return width, height
+
+
+def fit_backgrounds_to_render_frame(cameras: Iterable,
+                                    scene,
+                                    method: str = 'CROP',
+                                    anchor: str = 'FRAME',
+                                    only_visible: bool = False) -> int:
+    """Set offset, scale and frame method of stretched camera backgrounds to match render frame.
+
+    Return number of fitted backgrounds.
+    """
+    render = scene.render
+    frame_aspect = ((render.resolution_x * render.pixel_aspect_x)
+                    / (render.resolution_y * render.pixel_aspect_y))
+
+    # camera data can be shared between objects
+    cam_datas = list(dict.fromkeys(cam.data for cam in cameras if cam.type == 'CAMERA'))
+
+    bg_indices = []
+    image_aspect = []
+    frame_method = []
+    shift_x = []
+    shift_y = []
+    spans = []
+    for cam_data in cam_datas:
+        start = len(bg_indices)
+        for i, bg in enumerate(cam_data.background_images):
+            if only_visible and not bg.show_background_image:
+                continue
+            size = get_background_source_size(bg)
+            if size is None:
+                continue
+
+            bg_indices.append(i)
+            image_aspect.append(size[0] / size[1])
+            frame_method.append(FRAME_METHODS.index(bg.frame_method))
+            shift_x.append(cam_data.shift_x)
+            shift_y.append(cam_data.shift_y)
+        spans.append((cam_data, start, len(bg_indices)))
+
+    if not bg_indices:
+        return 0
+
+    offset, scale, new_frame_method = solve_render_frame_fit(frame_aspect, image_aspect, frame_method, shift_x,
+                                                             shift_y, method=method, anchor=anchor)
+
+    bg_indices = np.array(bg_indices)
+    for cam_data, start, end in spans:
+        if start == end:
+            continue
+
+        backgrounds = cam_data.background_images
+        cam_offset = np.empty((len(backgrounds), 2), dtype=np.float32)
+        cam_scale = np.empty(len(backgrounds), dtype=np.float32)
+        backgrounds.foreach_get("offset", cam_offset.ravel())
+        backgrounds.foreach_get("scale", cam_scale)
+
+        indices = bg_indices[start:end]
+        cam_offset[indices] = offset[start:end]
+        cam_scale[indices] = scale[start:end]
+        backgrounds.foreach_set("offset", cam_offset.ravel())
+        backgrounds.foreach_set("scale", cam_scale)
+        # stretched backgrounds switched to the method
+        for i, old_method, new_method in zip(indices, frame_method[start:end], new_frame_method[start:end]):
+            if old_method != new_method:
+                backgrounds[i].frame_method = FRAME_METHODS[new_method]
+        cam_data.update_tag()
+
+    return len(bg_indices)
@@ -0,0 +1,111 @@
+from typing import Optional
+
+from math import cos
+from math import sin
+
+import numpy as np
+
+
+def get_background_size(frame_width: float,
+                        frame_height: float,
+                        image_aspect: float,
+                        frame_method: str) -> tuple[float, float]:
+    """Return size of background image with scale 1 drawn in camera frame of given size."""
+    if frame_method == 'STRETCH':
+        return frame_width, frame_height
+
+    frame_aspect = frame_width / frame_height
+    if (image_aspect > frame_aspect) == (frame_method == 'FIT'):
+        return frame_width, frame_width / image_aspect
+    return frame_height * image_aspect, frame_height
+
+
+def get_sensor_fit_size(frame_width: float, frame_height: float, sensor_fit: str) -> float:
+    """Return size of camera frame along its sensor fit dimension."""
+    if sensor_fit == 'HORIZONTAL' or (sensor_fit == 'AUTO' and frame_width >= frame_height):
+        return frame_width
+    return frame_height
+
+
+def get_offset_units(frame_aspect, image_aspect):
+    """Return length of unit background offset along x and y, measured in sensor fit size of camera frame.
+
+    Matches camera_background_images_matrix_get of Blender, including its aspect correction of offset kept for 2.80
+    compatibility. Works on numbers and arrays.
+    """
+    return np.minimum(frame_aspect, 1.0), frame_aspect / (np.maximum(frame_aspect, 1.0) * image_aspect)
+
+
+def get_background_corners(frame_rect: tuple[float, float, float, float],
+                           image_aspect: float,
+                           frame_method: str,
+                           sensor_fit: str,
+                           offset: tuple[float, float],
+                           rotation: float,
+                           scale: float) -> list[tuple[float, float]]:
+    """Return background image corners in frame coordinates.
+
+    Corners go counter-clockwise starting from the bottom left one.
+    """
+    xmin, ymin, xmax, ymax = frame_rect
+    frame_width = xmax - xmin
+    frame_height = ymax - ymin
+
+    width, height = get_background_size(frame_width, frame_height, image_aspect, frame_method)
+    half_width = width * scale / 2
+    half_height = height * scale / 2
+
+    fit_size = get_sensor_fit_size(frame_width, frame_height, sensor_fit)
+    unit_x, unit_y = get_offset_units(frame_width / frame_height, image_aspect)
+    center_x = (xmin + xmax) / 2 + offset[0] * fit_size * float(unit_x)
+    center_y = (ymin + ymax) / 2 + offset[1] * fit_size * float(unit_y)
+
+    rot_cos = cos(-rotation)
+    rot_sin = sin(-rotation)
+
+    corners = []
+    for x, y in ((-half_width, -half_height),
+                 (half_width, -half_height),
+                 (half_width, half_height),
+                 (-half_width, half_height)):
+        corners.append((center_x + x * rot_cos - y * rot_sin,
+                        center_y + x * rot_sin + y * rot_cos))
+    return corners
+
+
+def get_background_uvs(flip_x: bool, flip_y: bool) -> list[tuple[float, float]]:
+    """Return texture coordinates matching corners from get_background_corners."""
+    u0, u1 = (1.0, 0.0) if flip_x else (0.0, 1.0)
+    v0, v1 = (1.0, 0.0) if flip_y else (0.0, 1.0)
+    return [(u0, v0), (u1, v0), (u1, v1), (u0, v1)]
+
+
+def get_background_point(corners: list[tuple[float, float]], u: float, v: float) -> tuple[float, float]:
+    """Return frame coordinates of a point on background image given by its unflipped texture coordinates."""
+    (x0, y0), (x1, y1), _, (x3, y3) = corners
+    return x0 + u * (x1 - x0) + v * (x3 - x0), y0 + u * (y1 - y0) + v * (y3 - y0)
+
+
+def get_background_uv(corners: list[tuple[float, float]], x: float, y: float) -> tuple[float, float]:
+    """Return unflipped texture coordinates of a point in frame coordinates."""
+    (x0, y0), (x1, y1), _, (x3, y3) = corners
+    e1x, e1y = x1 - x0, y1 - y0
+    e2x, e2y = x3 - x0, y3 - y0
+    dx, dy = x - x0, y - y0
+    det = e1x * e2y - e1y * e2x
+    return (dx * e2y - dy * e2x) / det, (e1x * dy - e1y * dx) / det
+
+
+def get_visible_uv_rect(corners: list[tuple[float, float]],
+                        frame_rect: tuple[float, float, float, float]
+                        ) -> Optional[tuple[float, float, float, float]]:
+    """Return bounds of unflipped texture coordinates of background image visible in the frame."""
+    xmin, ymin, xmax, ymax = frame_rect
+    uvs = [get_background_uv(corners, x, y) for x, y in ((xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax))]
+    u0 = max(min(u for u, _ in uvs), 0.0)
+    v0 = max(min(v for _, v in uvs), 0.0)
+    u1 = min(max(u for u, _ in uvs), 1.0)
+    v1 = min(max(v for _, v in uvs), 1.0)
+    if u0 >= u1 or v0 >= v1:
+        return None
+    return u0, v0, u1, v1
@@ -7,3 +7,11 @@ def event_match_kmi(operator, event, idname: str, release: bool = False) -> bool
                 and event.alt == kmi.alt
                 and event.ctrl == kmi.ctrl
                 and event.shift == kmi.shift)
+
+
+def is_snapping(context, event) -> bool:
+    """Return whether transform should snap to increments."""
+    tool_settings = context.scene.tool_settings
+    return event.ctrl or (tool_settings.use_snap
+                          and tool_settings.use_snap_scale
+                          and tool_settings.snap_elements == 'INCREMENT')
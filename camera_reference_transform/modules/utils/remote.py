@@ -0,0 +1,274 @@
+"""Local socket server receiving background transform edits from other applications.
+
+Messages are length-prefixed frames: 4 bytes of big-endian payload size followed by a JSON or msgpack payload.
+A payload is an object {"id": ..., "ops": [...]}, a list of ops or a single op. An op looks like
+{"camera": "Camera", "index": 0, "mode": "set" or "add", "offset": [x, y], "rotation": r, "scale": s,
+"flip_x": bool, "flip_y": bool}. In add mode values are increments and true flips are toggled. Messages having
+an id get a reply once they are applied.
+"""
+import asyncio
+import json
+import math
+import os
+import queue
+import stat
+import threading
+from typing import Optional
+
+from .transform import MIN_SCALE
+from .transform import BackgroundState
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+FLOAT_FIELDS = ("offset_x", "offset_y", "rotation", "scale")
+FLIP_FIELDS = ("flip_x", "flip_y")
+
+
+def encode(payload, encoding: str) -> bytes:
+    if encoding == 'msgpack':
+        return msgpack.packb(payload)
+    return json.dumps(payload).encode()
+
+
+def decode(data: bytes) -> tuple[object, str]:
+    """Return decoded payload and its encoding, JSON is recognized by its first character."""
+    if data.lstrip()[:1] in (b"{", b"["):
+        return json.loads(data), 'json'
+    if msgpack is None:
+        raise ValueError("Payload is not JSON and msgpack is not installed")
+    return msgpack.unpackb(data), 'msgpack'
+
+
+def parse_number(value, name: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number")
+    # JSON decoder accepts NaN and Infinity
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be finite")
+    return float(value)
+
+
+def parse_op(op) -> tuple[str, int, str, dict]:
+    """Return camera name, background index, mode and edited fields of an op."""
+    if not isinstance(op, dict):
+        raise ValueError("Op must be an object")
+
+    camera = op.get("camera")
+    if not isinstance(camera, str):
+        raise ValueError("Op must have camera name")
+    index = op.get("index", 0)
+    if isinstance(index, bool) or not isinstance(index, int) or index < 0:
+        raise ValueError("Index must be a non-negative integer")
+    mode = op.get("mode", "set")
+    if mode not in ("set", "add"):
+        raise ValueError("Mode must be set or add")
+
+    fields = {}
+    if "offset" in op:
+        offset = op["offset"]
+        if not isinstance(offset, (list, tuple)) or len(offset) != 2:
+            raise ValueError("offset must be a pair of numbers")
+        fields["offset_x"] = parse_number(offset[0], "offset")
+        fields["offset_y"] = parse_number(offset[1], "offset")
+    for name in ("rotation", "scale"):
+        if name in op:
+            fields[name] = parse_number(op[name], name)
+    for name in FLIP_FIELDS:
+        if name in op:
+            if not isinstance(op[name], bool):
+                raise ValueError(f"{name} must be a boolean")
+            fields[name] = op[name]
+
+    if not fields:
+        raise ValueError("Op does not change anything")
+    return camera, index, mode, fields
+
+
+def parse_message(payload) -> tuple[object, list[tuple[str, int, str, dict]]]:
+    """Return message id and parsed ops."""
+    message_id = None
+    if isinstance(payload, dict) and "ops" in payload:
+        message_id = payload.get("id")
+        ops = payload["ops"]
+    elif isinstance(payload, dict):
+        ops = [payload]
+    else:
+        ops = payload
+    if not isinstance(ops, list):
+        raise ValueError("Ops must be a list")
+    return message_id, [parse_op(op) for op in ops]
+
+
+def remove_socket(path: str) -> None:
+    """Remove socket left by previous server, raise OSError if there is another file at the path."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{path} is not a socket")
+    os.remove(path)
+
+
+class PendingEdit:
+    """Edits of a single background coalesced from many ops."""
+
+    __slots__ = ("values", "deltas", "flips", "toggles")
+
+    def __init__(self):
+        self.values: dict[str, float] = {}
+        self.deltas: dict[str, float] = {}
+        self.flips: dict[str, bool] = {}
+        self.toggles: dict[str, bool] = {}
+
+    def merge(self, mode: str, fields: dict) -> None:
+        for name, value in fields.items():
+            if name in FLIP_FIELDS:
+                if mode == "set":
+                    self.flips[name] = value
+                    self.toggles[name] = False
+                else:
+                    self.toggles[name] = self.toggles.get(name, False) != value
+            elif mode == "set":
+                self.values[name] = value
+                self.deltas[name] = 0.0
+            else:
+                self.deltas[name] = self.deltas.get(name, 0.0) + value
+
+    def apply(self, state: BackgroundState) -> None:
+        for name in FLOAT_FIELDS:
+            if name in self.values or name in self.deltas:
+                base = self.values.get(name, getattr(state, name))
+                setattr(state, name, base + self.deltas.get(name, 0.0))
+        state.scale = max(state.scale, MIN_SCALE)
+
+        for name in FLIP_FIELDS:
+            flip = self.flips.get(name, getattr(state, name))
+            setattr(state, name, flip != self.toggles.get(name, False))
+
+
+class RemoteMessage:
+    __slots__ = ("id", "ops", "writer", "encoding")
+
+    def __init__(self, message_id, ops: list, writer: asyncio.StreamWriter, encoding: str):
+        self.id = message_id
+        self.ops = ops
+        self.writer = writer
+        self.encoding = encoding
+
+
+class RemoteServer:
+    """Server accepting messages in a background thread running asyncio loop.
+
+    Messages are only parsed there, they are queued to be applied by whoever calls drain.
+    """
+
+    def __init__(self, port: int = 0, socket_path: str = ""):
+        self.port = port
+        self.socket_path = socket_path
+        self.address = None
+        self.messages: queue.SimpleQueue[RemoteMessage] = queue.SimpleQueue()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> None:
+        """Start the server thread, raise OSError when the socket can't be opened."""
+        self._thread = threading.Thread(target=self._run, name="reference_transforms_remote", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+
+    def stop(self) -> None:
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        if self.socket_path and self.address is not None:
+            try:
+                remove_socket(self.socket_path)
+            except OSError:
+                # replaced with something else since the server started
+                pass
+
+    def drain(self) -> list[RemoteMessage]:
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def reply(self, message: RemoteMessage, payload: dict) -> None:
+        """Send reply from any thread."""
+        data = encode(payload, message.encoding)
+        self._loop.call_soon_threadsafe(self._write, message.writer, data)
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, data: bytes) -> None:
+        if not writer.is_closing():
+            writer.write(len(data).to_bytes(4, 'big') + data)
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            if self.socket_path:
+                if not hasattr(asyncio, "start_unix_server"):
+                    raise OSError("Unix domain sockets are not supported on this platform")
+                remove_socket(self.socket_path)
+                server = self._loop.run_until_complete(
+                    asyncio.start_unix_server(self._handle_client, path=self.socket_path))
+            else:
+                server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle_client, host="127.0.0.1", port=self.port))
+        except OSError as e:
+            self._error = e
+            self._loop.close()
+            self._started.set()
+            return
+
+        self.address = server.sockets[0].getsockname()
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.run_until_complete(server.wait_closed())
+            self._loop.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                length = int.from_bytes(await reader.readexactly(4), 'big')
+                if length > MAX_MESSAGE_SIZE:
+                    break
+                data = await reader.readexactly(length)
+
+                encoding = 'json'
+                try:
+                    payload, encoding = decode(data)
+                    message_id, ops = parse_message(payload)
+                except ValueError as e:
+                    self._write(writer, encode({"error": str(e)}, encoding))
+                    continue
+                self.messages.put(RemoteMessage(message_id, ops, writer, encoding))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # server is stopping, finish quietly instead of leaving asyncio to log the cancelled task
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,45 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+from .tiles import oiio
+from .tiles import to_rgba
+
+THUMBNAIL_SIZE = 128
+
+
+def get_thumbnail_size(width: int, height: int, size: int = THUMBNAIL_SIZE) -> tuple[int, int]:
+    """Return size of thumbnail fitting into square of given size, never larger than the image."""
+    scale = min(size / max(width, height), 1.0)
+    return max(round(width * scale), 1), max(round(height * scale), 1)
+
+
+def load_thumbnail(path: str) -> Optional[np.ndarray]:
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+def save_thumbnail(path: str, pixels: np.ndarray) -> None:
+    """Save thumbnail atomically, so other Blender instances never read a partially written file."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.save(f, pixels)
+    os.replace(temp_path, path)
+
+
+def make_thumbnail(source_path: str, thumbnail_path: str) -> np.ndarray:
+    """Decode image file into RGBA thumbnail with rows counted from the bottom and save it to the cache.
+
+    Requires OpenImageIO, safe to run in worker threads.
+    """
+    buffer = oiio.ImageBuf(source_path)
+    spec = buffer.spec()
+    width, height = get_thumbnail_size(spec.width, spec.height)
+    resized = oiio.ImageBufAlgo.resize(buffer, roi=oiio.ROI(0, width, 0, height, 0, 1, 0, spec.nchannels))
+    pixels = to_rgba(resized.get_pixels(oiio.UINT8).reshape(height, width, -1))[::-1]
+    pixels = np.ascontiguousarray(pixels)
+    save_thumbnail(thumbnail_path, pixels)
+    return pixels
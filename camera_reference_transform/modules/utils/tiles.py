@@ -0,0 +1,232 @@
+import json
+import os
+import threading
+from math import floor
+from math import log2
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
+TILE_SIZE = 512
+
+source_buffers: dict[str, object] = {}
+source_buffers_lock = threading.Lock()
+
+
+def to_rgba(pixels: np.ndarray) -> np.ndarray:
+    """Return uint8 pixels shaped (height, width, channels) converted to RGBA."""
+    if pixels.ndim == 2:
+        pixels = pixels[..., None]
+
+    channels = pixels.shape[-1]
+    if channels >= 4:
+        return np.ascontiguousarray(pixels[..., :4])
+
+    rgba = np.full(pixels.shape[:2] + (4,), 255, dtype=np.uint8)
+    if channels == 3:
+        rgba[..., :3] = pixels
+    else:
+        rgba[..., :3] = pixels[..., :1]
+        if channels == 2:
+            rgba[..., 3] = pixels[..., 1]
+    return rgba
+
+
+def get_source_buffer(path: str):
+    """Return OpenImageIO buffer reading the file lazily through the shared image cache."""
+    with source_buffers_lock:
+        buffer = source_buffers.get(path)
+        if buffer is None:
+            buffer = source_buffers[path] = oiio.ImageBuf(path)
+        return buffer
+
+
+def read_source_size(path: str) -> Optional[tuple[int, int]]:
+    """Return image size read from file header, None when OpenImageIO is not available."""
+    if oiio is None:
+        return None
+
+    spec = get_source_buffer(path).spec()
+    if not spec.width or not spec.height:
+        return None
+    return spec.width, spec.height
+
+
+def read_source_region(path: str, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+    """Decode region of image file, rows are counted from the bottom like in Blender."""
+    buffer = get_source_buffer(path)
+    spec = buffer.spec()
+    roi = oiio.ROI(spec.x + x0, spec.x + x1, spec.y + spec.height - y1, spec.y + spec.height - y0,
+                   0, 1, 0, spec.nchannels)
+    pixels = buffer.get_pixels(oiio.UINT8, roi)
+    return to_rgba(pixels.reshape(y1 - y0, x1 - x0, -1))[::-1]
+
+
+def release_source_buffers() -> None:
+    with source_buffers_lock:
+        source_buffers.clear()
+
+
+def open_array(path: str, shape: tuple, dtype) -> np.ndarray:
+    """Open memory-mapped array file, creating a zeroed one if it is missing or has other shape."""
+    if os.path.isfile(path):
+        try:
+            array = np.load(path, mmap_mode='r+')
+            if array.shape == shape and array.dtype == dtype:
+                return array
+        except (OSError, ValueError):
+            pass
+    return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+
+def downsample_rgba(pixels: np.ndarray) -> np.ndarray:
+    """Return uint8 pixels halved with a 2x2 box filter."""
+    pixels = pixels.astype(np.uint16)
+    summed = pixels[0::2, 0::2] + pixels[1::2, 0::2] + pixels[0::2, 1::2] + pixels[1::2, 1::2]
+    return ((summed + 2) // 4).astype(np.uint8)
+
+
+class TiledImage:
+    """Image pyramid stored on disk as memory-mapped RGBA arrays, filled tile by tile.
+
+    Level 0 tiles are decoded from the source by reader, coarser levels are downsampled from finer ones.
+    Tile decoding is thread-safe, so tiles can be requested from a worker pool.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 width: int,
+                 height: int,
+                 reader: Optional[Callable[[int, int, int, int], np.ndarray]] = None):
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.reader = reader
+
+        self.sizes = [(width, height)]
+        while max(self.sizes[-1]) > TILE_SIZE and min(self.sizes[-1]) > 1:
+            level_width, level_height = self.sizes[-1]
+            self.sizes.append((level_width // 2, level_height // 2))
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "meta.json"), 'w') as f:
+            json.dump({"width": width, "height": height, "tile_size": TILE_SIZE}, f)
+
+        self.levels = []
+        self.ready = []
+        for level, (level_width, level_height) in enumerate(self.sizes):
+            self.levels.append(open_array(os.path.join(directory, f"level_{level}.npy"),
+                                          (level_height, level_width, 4), np.uint8))
+            self.ready.append(open_array(os.path.join(directory, f"level_{level}_ready.npy"),
+                                         self.get_tile_count(level)[::-1], np.bool_))
+
+        self._lock = threading.Lock()
+        self._tile_locks: dict[tuple[int, int, int], threading.Lock] = {}
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["TiledImage"]:
+        """Open cache written before, without a reader for the source."""
+        try:
+            with open(os.path.join(directory, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("tile_size") != TILE_SIZE:
+            return None
+        return cls(directory, meta["width"], meta["height"])
+
+    @property
+    def max_level(self) -> int:
+        return len(self.sizes) - 1
+
+    def get_tile_count(self, level: int) -> tuple[int, int]:
+        width, height = self.sizes[level]
+        return -(-width // TILE_SIZE), -(-height // TILE_SIZE)
+
+    def get_tile_bounds(self, level: int, tx: int, ty: int) -> tuple[int, int, int, int]:
+        width, height = self.sizes[level]
+        return (tx * TILE_SIZE, ty * TILE_SIZE,
+                min((tx + 1) * TILE_SIZE, width), min((ty + 1) * TILE_SIZE, height))
+
+    def get_tile_uv_rect(self, level: int, tx: int, ty: int) -> tuple[float, float, float, float]:
+        width, height = self.sizes[level]
+        x0, y0, x1, y1 = self.get_tile_bounds(level, tx, ty)
+        return x0 / width, y0 / height, x1 / width, y1 / height
+
+    def get_level(self, source_pixels_per_screen_pixel: float) -> int:
+        """Return the coarsest level still having at least one pixel per screen pixel."""
+        if source_pixels_per_screen_pixel <= 1:
+            return 0
+        return min(floor(log2(source_pixels_per_screen_pixel)), self.max_level)
+
+    def get_tiles_in_uv_rect(self,
+                             level: int,
+                             u0: float,
+                             v0: float,
+                             u1: float,
+                             v1: float) -> list[tuple[int, int]]:
+        width, height = self.sizes[level]
+        tiles_x, tiles_y = self.get_tile_count(level)
+        tx0 = max(int(u0 * width) // TILE_SIZE, 0)
+        ty0 = max(int(v0 * height) // TILE_SIZE, 0)
+        tx1 = min(int(u1 * width) // TILE_SIZE, tiles_x - 1)
+        ty1 = min(int(v1 * height) // TILE_SIZE, tiles_y - 1)
+        return [(tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)]
+
+    def is_tile_ready(self, level: int, tx: int, ty: int) -> bool:
+        return bool(self.ready[level][ty, tx])
+
+    def is_level_ready(self, level: int) -> bool:
+        return bool(self.ready[level].all())
+
+    def get_tile(self, level: int, tx: int, ty: int) -> np.ndarray:
+        x0, y0, x1, y1 = self.get_tile_bounds(level, tx, ty)
+        return self.levels[level][y0:y1, x0:x1]
+
+    def get_tile_lock(self, level: int, tx: int, ty: int) -> threading.Lock:
+        with self._lock:
+            return self._tile_locks.setdefault((level, tx, ty), threading.Lock())
+
+    def decode_tile(self, level: int, tx: int, ty: int) -> None:
+        """Fill tile, decoding or downsampling finer tiles it depends on first."""
+        with self.get_tile_lock(level, tx, ty):
+            if self.is_tile_ready(level, tx, ty):
+                return
+
+            x0, y0, x1, y1 = self.get_tile_bounds(level, tx, ty)
+            if level == 0:
+                if self.reader is None:
+                    raise RuntimeError("Source of tiled image can not be read")
+                pixels = self.reader(x0, y0, x1, y1)
+            else:
+                tiles_x, tiles_y = self.get_tile_count(level - 1)
+                for child_ty in range(ty * 2, min(ty * 2 + 2, tiles_y)):
+                    for child_tx in range(tx * 2, min(tx * 2 + 2, tiles_x)):
+                        self.decode_tile(level - 1, child_tx, child_ty)
+                pixels = downsample_rgba(self.levels[level - 1][y0 * 2:y1 * 2, x0 * 2:x1 * 2])
+
+            self.levels[level][y0:y1, x0:x1] = pixels
+            self.ready[level][ty, tx] = True
+
+    def read_level(self, level: int) -> np.ndarray:
+        """Decode all tiles of the level and return its pixels."""
+        tiles_x, tiles_y = self.get_tile_count(level)
+        for ty in range(tiles_y):
+            for tx in range(tiles_x):
+                self.decode_tile(level, tx, ty)
+        return np.array(self.levels[level])
+
+    def write_level(self, level: int, pixels: np.ndarray) -> None:
+        """Fill the whole level from already decoded pixels."""
+        self.levels[level][:] = pixels
+        self.ready[level][:] = True
+
+    def flush(self) -> None:
+        for array in self.levels + self.ready:
+            array.flush()
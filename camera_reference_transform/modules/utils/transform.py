@@ -0,0 +1,262 @@
+"""Background transform math shared by modal operators and scripted edits.
+
+Nothing here imports bpy, backgrounds are accessed only through their offset, rotation, scale, use_flip_x and
+use_flip_y attributes, so the module can be used and tested outside Blender. Tests are in tests/test_transform.py.
+"""
+from math import degrees
+from math import radians
+
+import numpy as np
+
+MOVE_DIVISOR = 600
+ROTATE_DIVISOR = 450
+SCALE_DIVISOR = 300
+FINE_FACTOR = 10
+
+OFFSET_INCREMENT = 0.01
+ROTATION_INCREMENT = 15  # degrees
+SCALE_INCREMENT = 0.1
+MIN_SCALE = 0.01
+
+
+def get_divisor(divisor: int, fine: bool) -> int:
+    return divisor * FINE_FACTOR if fine else divisor
+
+
+def snap_offset(value: float) -> float:
+    return round(value / OFFSET_INCREMENT) * OFFSET_INCREMENT
+
+
+def snap_rotation(value: float) -> float:
+    return radians(round(degrees(value) / ROTATION_INCREMENT) * ROTATION_INCREMENT)
+
+
+def snap_scale(value: float) -> float:
+    return round(value / SCALE_INCREMENT) * SCALE_INCREMENT
+
+
+class BackgroundState:
+    """Transform of a single camera background."""
+
+    __slots__ = ("offset_x", "offset_y", "rotation", "scale", "flip_x", "flip_y")
+
+    def __init__(self,
+                 offset_x: float = 0.0,
+                 offset_y: float = 0.0,
+                 rotation: float = 0.0,
+                 scale: float = 1.0,
+                 flip_x: bool = False,
+                 flip_y: bool = False):
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.rotation = rotation
+        self.scale = scale
+        self.flip_x = flip_x
+        self.flip_y = flip_y
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other):
+        if not isinstance(other, BackgroundState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def copy(self) -> "BackgroundState":
+        return BackgroundState(*(getattr(self, name) for name in self.__slots__))
+
+    def toggle_flip_x(self) -> None:
+        self.flip_x = not self.flip_x
+
+    def toggle_flip_y(self) -> None:
+        self.flip_y = not self.flip_y
+
+
+class MoveDrag:
+    """Background offset accumulated from mouse movement."""
+
+    __slots__ = ("state", "offset_x", "offset_y")
+
+    def __init__(self, state: BackgroundState):
+        self.state = state
+        self.offset_x = state.offset_x
+        self.offset_y = state.offset_y
+
+    def drag(self,
+             delta_x: float,
+             delta_y: float,
+             fine: bool = False,
+             snap: bool = False,
+             constraint_axis: tuple[bool, bool] = (False, False)) -> None:
+        """Move background by mouse delta, axes set in constraint_axis stay locked."""
+        divisor = get_divisor(MOVE_DIVISOR, fine)
+        if not constraint_axis[0]:
+            self.offset_x += delta_x / divisor
+        if not constraint_axis[1]:
+            self.offset_y += delta_y / divisor
+
+        if snap:
+            self.state.offset_x = snap_offset(self.offset_x)
+            self.state.offset_y = snap_offset(self.offset_y)
+        else:
+            self.state.offset_x = self.offset_x
+            self.state.offset_y = self.offset_y
+
+
+class RotateDrag:
+    """Background rotation accumulated from mouse movement."""
+
+    __slots__ = ("state", "rotation")
+
+    def __init__(self, state: BackgroundState):
+        self.state = state
+        self.rotation = state.rotation
+
+    def drag(self, delta_x: float, fine: bool = False, snap: bool = False) -> None:
+        self.rotation += delta_x / get_divisor(ROTATE_DIVISOR, fine)
+        self.state.rotation = snap_rotation(self.rotation) if snap else self.rotation
+
+
+class ScaleDrag:
+    """Background scale accumulated from mouse movement.
+
+    Like in the original operator only the written scale is clamped, dragging back after an overshoot below
+    MIN_SCALE returns to the same scale.
+    """
+
+    __slots__ = ("state", "scale")
+
+    def __init__(self, state: BackgroundState):
+        self.state = state
+        self.scale = state.scale
+
+    def drag(self, delta_x: float, fine: bool = False, snap: bool = False) -> None:
+        self.scale += delta_x / get_divisor(SCALE_DIVISOR, fine)
+        self.state.scale = max(snap_scale(self.scale) if snap else self.scale, MIN_SCALE)
+
+
+def read_background_state(bg) -> BackgroundState:
+    return BackgroundState(bg.offset[0], bg.offset[1], bg.rotation, bg.scale, bg.use_flip_x, bg.use_flip_y)
+
+
+def write_background_state(bg, state: BackgroundState) -> None:
+    """Write state to background, skipping properties that have not changed."""
+    if bg.offset[0] != state.offset_x:
+        bg.offset[0] = state.offset_x
+    if bg.offset[1] != state.offset_y:
+        bg.offset[1] = state.offset_y
+    if bg.rotation != state.rotation:
+        bg.rotation = state.rotation
+    if bg.scale != state.scale:
+        bg.scale = state.scale
+    if bg.use_flip_x != state.flip_x:
+        bg.use_flip_x = state.flip_x
+    if bg.use_flip_y != state.flip_y:
+        bg.use_flip_y = state.flip_y
+
+
+class BackgroundStates:
+    """Transforms of many camera backgrounds stored in arrays."""
+
+    __slots__ = ("offset", "rotation", "scale", "flip")
+
+    def __init__(self, offset: np.ndarray, rotation: np.ndarray, scale: np.ndarray, flip: np.ndarray):
+        self.offset = np.asarray(offset, dtype=np.float64).reshape(-1, 2)
+        self.rotation = np.asarray(rotation, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.flip = np.asarray(flip, dtype=bool).reshape(-1, 2)
+
+    def __len__(self):
+        return len(self.scale)
+
+    @classmethod
+    def from_states(cls, states: list[BackgroundState]) -> "BackgroundStates":
+        return cls(
+            [(state.offset_x, state.offset_y) for state in states],
+            [state.rotation for state in states],
+            [state.scale for state in states],
+            [(state.flip_x, state.flip_y) for state in states],
+        )
+
+    def to_states(self) -> list[BackgroundState]:
+        return [
+            BackgroundState(float(offset[0]), float(offset[1]), float(rotation), float(scale),
+                            bool(flip[0]), bool(flip[1]))
+            for offset, rotation, scale, flip in zip(self.offset, self.rotation, self.scale, self.flip)
+        ]
+
+
+def get_batch_divisor(divisor: int, fine, ndim: int) -> np.ndarray:
+    """Return divisors for every step of deltas with given number of dimensions."""
+    divisors = np.where(np.asarray(fine), divisor * FINE_FACTOR, divisor)
+    if divisors.ndim == 1:
+        divisors = divisors.reshape((-1,) + (1,) * (ndim - 1))
+    return divisors
+
+
+def batch_move(states: BackgroundStates,
+               deltas,
+               fine=False,
+               snap: bool = False,
+               constraint_axis: tuple[bool, bool] = (False, False)) -> None:
+    """Apply sequence of mouse deltas shaped (steps, n, 2) or (steps, 2) to all backgrounds.
+
+    Fine can be given for every step. The result is the same as dragging each background with MoveDrag.
+    """
+    deltas = np.asarray(deltas, dtype=np.float64)
+    moved = (deltas / get_batch_divisor(MOVE_DIVISOR, fine, deltas.ndim)).sum(axis=0)
+    moved = moved * ~np.asarray(constraint_axis, dtype=bool)
+    offset = states.offset + moved
+    states.offset = np.round(offset / OFFSET_INCREMENT) * OFFSET_INCREMENT if snap else offset
+
+
+def batch_rotate(states: BackgroundStates, deltas, fine=False, snap: bool = False) -> None:
+    """Apply sequence of horizontal mouse deltas shaped (steps, n) or (steps,) to all backgrounds."""
+    deltas = np.asarray(deltas, dtype=np.float64)
+    rotation = states.rotation + (deltas / get_batch_divisor(ROTATE_DIVISOR, fine, deltas.ndim)).sum(axis=0)
+    if snap:
+        rotation = np.radians(np.round(np.degrees(rotation) / ROTATION_INCREMENT) * ROTATION_INCREMENT)
+    states.rotation = rotation
+
+
+def batch_scale(states: BackgroundStates, deltas, fine=False, snap: bool = False) -> None:
+    """Apply sequence of horizontal mouse deltas shaped (steps, n) or (steps,) to all backgrounds.
+
+    Clamping once at the end gives the same result as ScaleDrag, which clamps the written scale but not its sum.
+    """
+    deltas = np.asarray(deltas, dtype=np.float64)
+    scale = states.scale + (deltas / get_batch_divisor(SCALE_DIVISOR, fine, deltas.ndim)).sum(axis=0)
+    if snap:
+        scale = np.round(scale / SCALE_INCREMENT) * SCALE_INCREMENT
+    states.scale = np.maximum(scale, MIN_SCALE)
+
+
+def batch_flip(states: BackgroundStates, toggles) -> None:
+    """Toggle flips where toggles shaped (n, 2) or (2,) are set."""
+    states.flip = states.flip ^ np.asarray(toggles, dtype=bool)
+
+
+def read_background_states(backgrounds) -> BackgroundStates:
+    """Read transforms of all backgrounds in a collection at once."""
+    count = len(backgrounds)
+    offset = np.empty(count * 2, dtype=np.float32)
+    rotation = np.empty(count, dtype=np.float32)
+    scale = np.empty(count, dtype=np.float32)
+    flip_x = np.empty(count, dtype=bool)
+    flip_y = np.empty(count, dtype=bool)
+    backgrounds.foreach_get("offset", offset)
+    backgrounds.foreach_get("rotation", rotation)
+    backgrounds.foreach_get("scale", scale)
+    backgrounds.foreach_get("use_flip_x", flip_x)
+    backgrounds.foreach_get("use_flip_y", flip_y)
+    return BackgroundStates(offset, rotation, scale, np.column_stack((flip_x, flip_y)))
+
+
+def write_background_states(backgrounds, states: BackgroundStates) -> None:
+    """Write transforms to all backgrounds in a collection at once."""
+    backgrounds.foreach_set("offset", states.offset.astype(np.float32).ravel())
+    backgrounds.foreach_set("rotation", states.rotation.astype(np.float32))
+    backgrounds.foreach_set("scale", states.scale.astype(np.float32))
+    backgrounds.foreach_set("use_flip_x", np.ascontiguousarray(states.flip[:, 0]))
+    backgrounds.foreach_set("use_flip_y", np.ascontiguousarray(states.flip[:, 1]))
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from bpy.types import Object
+from bpy_extras.view3d_utils import location_3d_to_region_2d
+
+
+def get_view_camera(context) -> Optional[Object]:
+    """Return camera the 3D viewport looks through, None if it's not in camera view."""
+    space = context.space_data
+    rv3d = context.region_data
+    if space is None or space.type != 'VIEW_3D' or rv3d is None or rv3d.view_perspective != 'CAMERA':
+        return None
+
+    cam = space.camera if space.use_local_camera else context.scene.camera
+    if cam is None or cam.type != 'CAMERA':
+        return None
+    return cam
+
+
+def get_camera_frame_rect(context, cam: Object) -> Optional[tuple[float, float, float, float]]:
+    """Return camera frame bounds in region coordinates as xmin, ymin, xmax, ymax."""
+    region = context.region
+    rv3d = context.region_data
+    if region is None or rv3d is None:
+        return None
+
+    xs = []
+    ys = []
+    for co in cam.data.view_frame(scene=context.scene):
+        region_co = location_3d_to_region_2d(region, rv3d, cam.matrix_world @ co)
+        if region_co is None:
+            return None
+        xs.append(region_co.x)
+        ys.append(region_co.y)
+
+    if max(xs) - min(xs) <= 0 or max(ys) - min(ys) <= 0:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
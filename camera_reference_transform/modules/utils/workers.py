@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from ...package import get_preferences
+
+executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return worker pool shared by image decoding jobs."""
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=get_preferences().stream_workers,
+                                      thread_name_prefix="reference_transforms")
+    return executor
+
+
+def shutdown_executor() -> None:
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
@@ -0,0 +1,106 @@
+"""Stand-in client measuring throughput and latency of Reference Transforms remote control.
+
+Runs outside Blender, with remote control enabled in the add-on preferences:
+
+    python remote_client.py --camera Camera --messages 10000 --ops 10
+
+Every message nudges background offsets back and forth, so an even number of messages leaves them unchanged.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def encode(payload, use_msgpack: bool) -> bytes:
+    data = msgpack.packb(payload) if use_msgpack else json.dumps(payload).encode()
+    return len(data).to_bytes(4, 'big') + data
+
+
+def decode(data: bytes):
+    if data[:1] in (b"{", b"["):
+        return json.loads(data)
+    return msgpack.unpackb(data)
+
+
+async def run(args) -> None:
+    if args.socket:
+        reader, writer = await asyncio.open_unix_connection(args.socket)
+    else:
+        reader, writer = await asyncio.open_connection("127.0.0.1", args.port)
+
+    sent_at = {}
+    latencies = []
+    failed = 0
+
+    async def read_replies():
+        nonlocal failed
+        for _ in range(args.messages):
+            length = int.from_bytes(await reader.readexactly(4), 'big')
+            reply = decode(await reader.readexactly(length))
+            if "id" not in reply:
+                print(f"Error: {reply.get('error')}")
+                failed += 1
+                continue
+            latencies.append(time.perf_counter() - sent_at.pop(reply["id"]))
+            if reply["errors"]:
+                print(f"Error: {', '.join(reply['errors'])}")
+                failed += 1
+
+    reply_task = asyncio.create_task(read_replies())
+
+    start = time.perf_counter()
+    for i in range(args.messages):
+        step = args.step if i % 2 == 0 else -args.step
+        ops = [{"camera": args.camera, "index": args.index, "mode": "add", "offset": [step, step]}
+               for _ in range(args.ops)]
+        sent_at[i] = time.perf_counter()
+        writer.write(encode({"id": i, "ops": ops}, args.msgpack))
+        if args.rate:
+            await writer.drain()
+            await asyncio.sleep(1 / args.rate)
+        elif i % 100 == 0:
+            await writer.drain()
+    await writer.drain()
+
+    await asyncio.wait_for(reply_task, args.timeout)
+    elapsed = time.perf_counter() - start
+    writer.close()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    print(f"Messages: {args.messages} in {elapsed:.3f} s, {failed} failed")
+    print(f"Throughput: {args.messages / elapsed:.0f} messages/s, {args.messages * args.ops / elapsed:.0f} ops/s")
+    if latencies_ms:
+        print(f"Latency: mean {statistics.fmean(latencies_ms):.2f} ms, "
+              f"median {latencies_ms[len(latencies_ms) // 2]:.2f} ms, "
+              f"p95 {latencies_ms[int(len(latencies_ms) * 0.95)]:.2f} ms, "
+              f"max {latencies_ms[-1]:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765, help="localhost TCP port of the server")
+    parser.add_argument("--socket", default="", help="Unix domain socket of the server, used instead of port")
+    parser.add_argument("--camera", default="Camera", help="name of camera object")
+    parser.add_argument("--index", type=int, default=0, help="index of camera background")
+    parser.add_argument("--messages", type=int, default=1000, help="number of messages to send")
+    parser.add_argument("--ops", type=int, default=1, help="number of ops in every message")
+    parser.add_argument("--step", type=float, default=0.001, help="offset increment of every op")
+    parser.add_argument("--rate", type=float, default=0, help="messages per second, as fast as possible when 0")
+    parser.add_argument("--msgpack", action='store_true', help="send msgpack instead of JSON")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for replies")
+    args = parser.parse_args()
+
+    if args.msgpack and msgpack is None:
+        parser.error("msgpack is not installed")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compare per-state drags with the batch path, run from repository root: python -m tests.bench_transform"""
+import argparse
+import time
+
+import numpy as np
+
+from camera_reference_transform.modules.utils.transform import BackgroundState
+from camera_reference_transform.modules.utils.transform import BackgroundStates
+from camera_reference_transform.modules.utils.transform import MoveDrag
+from camera_reference_transform.modules.utils.transform import batch_move
+
+
+def bench_drags(states: list[BackgroundState], deltas: np.ndarray) -> float:
+    start = time.perf_counter()
+    for i, state in enumerate(states):
+        drag = MoveDrag(state)
+        for delta_x, delta_y in deltas[:, i].tolist():
+            drag.drag(delta_x, delta_y)
+    return time.perf_counter() - start
+
+
+def bench_batch(states: list[BackgroundState], deltas: np.ndarray) -> float:
+    start = time.perf_counter()
+    batch_states = BackgroundStates.from_states(states)
+    batch_move(batch_states, deltas)
+    batch_states.to_states()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backgrounds", type=int, default=1000, help="number of background states")
+    parser.add_argument("--steps", type=int, default=100, help="number of mouse deltas applied to every state")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    deltas = rng.normal(0, 20, (args.steps, args.backgrounds, 2))
+
+    drags_time = bench_drags([BackgroundState() for _ in range(args.backgrounds)], deltas)
+    batch_time = bench_batch([BackgroundState() for _ in range(args.backgrounds)], deltas)
+    print(f"{args.backgrounds} backgrounds, {args.steps} steps")
+    print(f"Drags: {drags_time * 1000:.1f} ms")
+    print(f"Batch: {batch_time * 1000:.1f} ms ({drags_time / batch_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
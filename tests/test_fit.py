@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from camera_reference_transform.modules.utils.fit import FRAME_METHODS
+from camera_reference_transform.modules.utils.fit import solve_render_frame_fit
+from camera_reference_transform.modules.utils.geometry import get_background_corners
+from camera_reference_transform.modules.utils.geometry import get_background_size
+
+FRAME_ASPECT = 16 / 9
+# wider, same and narrower than the frame
+IMAGE_ASPECTS = [3.0, FRAME_ASPECT, 1.0, 0.5]
+
+STRETCH = FRAME_METHODS.index('STRETCH')
+FIT = FRAME_METHODS.index('FIT')
+CROP = FRAME_METHODS.index('CROP')
+
+
+def solve(image_aspect, frame_method, method='CROP', anchor='FRAME', frame_aspect=FRAME_ASPECT, shift=(0.0, 0.0)):
+    count = len(image_aspect)
+    return solve_render_frame_fit(frame_aspect, image_aspect, frame_method, [shift[0]] * count, [shift[1]] * count,
+                                  method=method, anchor=anchor)
+
+
+def get_coverage(image_aspect, frame_method, scale, frame_aspect=FRAME_ASPECT):
+    """Return image size relative to frame size on both axes."""
+    width, height = get_background_size(frame_aspect, 1.0, image_aspect, FRAME_METHODS[frame_method])
+    return width * scale / frame_aspect, height * scale
+
+
+@pytest.mark.parametrize("frame_method", [FIT, CROP])
+@pytest.mark.parametrize("image_aspect", IMAGE_ASPECTS)
+def test_crop_fills_frame(frame_method, image_aspect):
+    _offset, scale, new_frame_method = solve([image_aspect], [frame_method], method='CROP')
+
+    assert new_frame_method[0] == frame_method
+    coverage = get_coverage(image_aspect, frame_method, scale[0])
+    assert min(coverage) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("frame_method", [FIT, CROP])
+@pytest.mark.parametrize("image_aspect", IMAGE_ASPECTS)
+def test_fit_fits_inside_frame(frame_method, image_aspect):
+    _offset, scale, new_frame_method = solve([image_aspect], [frame_method], method='FIT')
+
+    assert new_frame_method[0] == frame_method
+    coverage = get_coverage(image_aspect, frame_method, scale[0])
+    assert max(coverage) == pytest.approx(1.0)
+
+
+def test_crop_fit_scales():
+    # wider image fitted into the frame spans its width, cropped it spans its height
+    _offset, scale, _frame_method = solve([3.0, 3.0], [FIT, CROP], method='CROP')
+    np.testing.assert_allclose(scale, [3.0 / FRAME_ASPECT, 1.0])
+    _offset, scale, _frame_method = solve([3.0, 3.0], [FIT, CROP], method='FIT')
+    np.testing.assert_allclose(scale, [1.0, FRAME_ASPECT / 3.0])
+
+    # narrower image is the other way around
+    _offset, scale, _frame_method = solve([1.0, 1.0], [FIT, CROP], method='CROP')
+    np.testing.assert_allclose(scale, [FRAME_ASPECT, 1.0])
+    _offset, scale, _frame_method = solve([1.0, 1.0], [FIT, CROP], method='FIT')
+    np.testing.assert_allclose(scale, [1.0, 1 / FRAME_ASPECT])
+
+
+@pytest.mark.parametrize("method", ['CROP', 'FIT'])
+def test_stretch_gets_method(method):
+    offset, scale, frame_method = solve(IMAGE_ASPECTS, [STRETCH] * len(IMAGE_ASPECTS), method=method)
+
+    np.testing.assert_array_equal(frame_method, FRAME_METHODS.index(method))
+    np.testing.assert_allclose(scale, 1.0)
+    np.testing.assert_allclose(offset, 0.0)
+
+
+def test_frame_anchor_centers_image():
+    offset, _scale, _frame_method = solve(IMAGE_ASPECTS, [CROP] * len(IMAGE_ASPECTS), shift=(0.2, -0.1))
+    np.testing.assert_allclose(offset, 0.0)
+
+
+def test_optical_center_offset():
+    offset, _scale, _frame_method = solve([1.0, 2.0], [FIT, FIT], anchor='OPTICAL_CENTER', frame_aspect=0.5,
+                                          shift=(0.1, 0.2))
+    # x offset is measured in frame width, y offset in height of image spanning the frame width
+    np.testing.assert_allclose(offset, [[-0.2, -0.4], [-0.2, -0.8]])
+
+
+@pytest.mark.parametrize("sensor_fit", ['AUTO', 'HORIZONTAL', 'VERTICAL'])
+@pytest.mark.parametrize("frame_aspect", [FRAME_ASPECT, 1.0, 0.5])
+@pytest.mark.parametrize("image_aspect", IMAGE_ASPECTS)
+def test_optical_center_centers_image_on_lens_axis(sensor_fit, frame_aspect, image_aspect):
+    shift = (0.15, -0.05)
+    offset, scale, frame_method = solve([image_aspect], [CROP], anchor='OPTICAL_CENTER', frame_aspect=frame_aspect,
+                                        shift=shift)
+
+    # camera frame normalized to the sensor fit dimension, shifted away from the lens axis at the origin
+    if sensor_fit == 'HORIZONTAL' or (sensor_fit == 'AUTO' and frame_aspect >= 1):
+        width, height = 1.0, 1 / frame_aspect
+    else:
+        width, height = frame_aspect, 1.0
+    frame_rect = (shift[0] - width / 2, shift[1] - height / 2, shift[0] + width / 2, shift[1] + height / 2)
+
+    corners = get_background_corners(frame_rect, image_aspect, FRAME_METHODS[frame_method[0]], sensor_fit,
+                                     offset[0], 0.0, scale[0])
+    center = np.mean(corners, axis=0)
+    np.testing.assert_allclose(center, 0.0, atol=1e-9)
+
+
+def test_empty_input():
+    offset, scale, frame_method = solve([], [], anchor='OPTICAL_CENTER')
+
+    assert offset.shape == (0, 2)
+    assert scale.shape == (0,)
+    assert frame_method.shape == (0,)
@@ -0,0 +1,223 @@
+from math import degrees
+from math import radians
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from camera_reference_transform.modules.utils.transform import MIN_SCALE
+from camera_reference_transform.modules.utils.transform import BackgroundState
+from camera_reference_transform.modules.utils.transform import BackgroundStates
+from camera_reference_transform.modules.utils.transform import MoveDrag
+from camera_reference_transform.modules.utils.transform import RotateDrag
+from camera_reference_transform.modules.utils.transform import ScaleDrag
+from camera_reference_transform.modules.utils.transform import batch_flip
+from camera_reference_transform.modules.utils.transform import batch_move
+from camera_reference_transform.modules.utils.transform import batch_rotate
+from camera_reference_transform.modules.utils.transform import batch_scale
+from camera_reference_transform.modules.utils.transform import read_background_state
+from camera_reference_transform.modules.utils.transform import write_background_state
+
+STEPS = 200
+
+
+# math of modal operators before it was moved into the transform module
+
+
+def original_move(offset, deltas, fine, snap, constraint_axis):
+    offset_x_float, offset_y_float = offset
+    offset_x, offset_y = offset
+    for (delta_x, delta_y), shift, ctrl in zip(deltas, fine, snap):
+        divisor = 6000 if shift else 600
+        offset_x_float += delta_x / divisor if not constraint_axis[0] else 0
+        offset_y_float += delta_y / divisor if not constraint_axis[1] else 0
+        if ctrl:
+            offset_x = round(offset_x_float / .01) * .01
+            offset_y = round(offset_y_float / .01) * .01
+        else:
+            offset_x = offset_x_float
+            offset_y = offset_y_float
+    return offset_x, offset_y
+
+
+def original_rotate(rotation, deltas, fine, snap):
+    rotation_float = rotation
+    for delta_x, shift, ctrl in zip(deltas, fine, snap):
+        divisor = 4500 if shift else 450
+        rotation_float += delta_x / divisor
+        if ctrl:
+            rotation = radians(round(degrees(rotation_float) / 15) * 15)
+        else:
+            rotation = rotation_float
+    return rotation
+
+
+def original_scale(scale, deltas, fine, snap):
+    scale_float = scale
+    for delta_x, shift, ctrl in zip(deltas, fine, snap):
+        divisor = 3000 if shift else 300
+        scale_float += delta_x / divisor
+        if ctrl:
+            scale = max(round(scale_float / .1) * .1, 0.01)
+        else:
+            scale = max(scale_float, 0.01)
+    return scale
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def random_modifiers(rng):
+    return rng.random(STEPS) < 0.3, rng.random(STEPS) < 0.3
+
+
+@pytest.mark.parametrize("constraint_axis", [(False, False), (True, False), (False, True)])
+def test_move_drag_matches_original(rng, constraint_axis):
+    deltas = rng.normal(0, 20, (STEPS, 2))
+    fine, snap = random_modifiers(rng)
+
+    state = BackgroundState(0.1, -0.2)
+    drag = MoveDrag(state)
+    for delta, shift, ctrl in zip(deltas, fine, snap):
+        drag.drag(delta[0], delta[1], fine=shift, snap=ctrl, constraint_axis=constraint_axis)
+
+    expected = original_move((0.1, -0.2), deltas, fine, snap, constraint_axis)
+    assert (state.offset_x, state.offset_y) == pytest.approx(expected)
+
+
+def test_rotate_drag_matches_original(rng):
+    deltas = rng.normal(0, 20, STEPS)
+    fine, snap = random_modifiers(rng)
+
+    state = BackgroundState(rotation=0.5)
+    drag = RotateDrag(state)
+    for delta, shift, ctrl in zip(deltas, fine, snap):
+        drag.drag(delta, fine=shift, snap=ctrl)
+
+    assert state.rotation == pytest.approx(original_rotate(0.5, deltas, fine, snap))
+
+
+def test_scale_drag_matches_original(rng):
+    deltas = rng.normal(0, 20, STEPS)
+    fine, snap = random_modifiers(rng)
+
+    state = BackgroundState(scale=1.5)
+    drag = ScaleDrag(state)
+    for delta, shift, ctrl in zip(deltas, fine, snap):
+        drag.drag(delta, fine=shift, snap=ctrl)
+
+    assert state.scale == pytest.approx(original_scale(1.5, deltas, fine, snap))
+
+
+def test_scale_drag_recovers_from_overshoot():
+    state = BackgroundState(scale=1.0)
+    drag = ScaleDrag(state)
+    drag.drag(-600)
+    assert state.scale == MIN_SCALE
+    drag.drag(600)
+    assert state.scale == pytest.approx(original_scale(1.0, [-600, 600], [False, False], [False, False]))
+    assert state.scale == pytest.approx(1.0)
+
+
+def make_states(rng, count):
+    return [BackgroundState(*rng.normal(0, 0.5, 3), rng.uniform(0.05, 2), *rng.random(2) < 0.5) for _ in range(count)]
+
+
+def drag_states(states, drag_type, deltas, fine, snap, **kwargs):
+    for i, state in enumerate(states):
+        drag = drag_type(state)
+        for step, shift in zip(deltas, fine):
+            drag.drag(*np.atleast_1d(step[i]), fine=shift, snap=snap, **kwargs)
+
+
+def assert_states_equal(batch_states, states):
+    for actual, expected in zip(batch_states.to_states(), states):
+        assert (actual.offset_x, actual.offset_y) == pytest.approx((expected.offset_x, expected.offset_y))
+        assert actual.rotation == pytest.approx(expected.rotation)
+        assert actual.scale == pytest.approx(expected.scale)
+        assert (actual.flip_x, actual.flip_y) == (expected.flip_x, expected.flip_y)
+
+
+@pytest.mark.parametrize("snap", [False, True])
+@pytest.mark.parametrize("constraint_axis", [(False, False), (True, False)])
+def test_batch_move_matches_drag(rng, snap, constraint_axis):
+    states = make_states(rng, 8)
+    batch_states = BackgroundStates.from_states(states)
+    deltas = rng.normal(0, 20, (STEPS, len(states), 2))
+    fine = rng.random(STEPS) < 0.3
+
+    batch_move(batch_states, deltas, fine=fine, snap=snap, constraint_axis=constraint_axis)
+    drag_states(states, MoveDrag, deltas, fine, snap, constraint_axis=constraint_axis)
+    assert_states_equal(batch_states, states)
+
+
+@pytest.mark.parametrize("snap", [False, True])
+def test_batch_rotate_matches_drag(rng, snap):
+    states = make_states(rng, 8)
+    batch_states = BackgroundStates.from_states(states)
+    deltas = rng.normal(0, 20, (STEPS, len(states)))
+    fine = rng.random(STEPS) < 0.3
+
+    batch_rotate(batch_states, deltas, fine=fine, snap=snap)
+    drag_states(states, RotateDrag, deltas, fine, snap)
+    assert_states_equal(batch_states, states)
+
+
+@pytest.mark.parametrize("snap", [False, True])
+def test_batch_scale_matches_drag(rng, snap):
+    states = make_states(rng, 8)
+    batch_states = BackgroundStates.from_states(states)
+    deltas = rng.normal(0, 20, (STEPS, len(states)))
+    fine = rng.random(STEPS) < 0.3
+
+    batch_scale(batch_states, deltas, fine=fine, snap=snap)
+    drag_states(states, ScaleDrag, deltas, fine, snap)
+    assert_states_equal(batch_states, states)
+
+
+@pytest.mark.parametrize("deltas", [[-600, 600], [-600, 300], [-600, 0], [-600, -600]])
+def test_batch_scale_matches_drag_after_overshoot(deltas):
+    states = [BackgroundState(scale=1.0), BackgroundState(scale=0.5)]
+    batch_states = BackgroundStates.from_states(states)
+    batch_deltas = np.repeat(np.array(deltas, dtype=np.float64)[:, None], len(states), axis=1)
+
+    batch_scale(batch_states, batch_deltas)
+    drag_states(states, ScaleDrag, batch_deltas, [False] * len(deltas), False)
+    assert_states_equal(batch_states, states)
+    assert (batch_states.scale >= MIN_SCALE).all()
+
+
+def test_batch_flip_matches_toggles(rng):
+    states = make_states(rng, 8)
+    batch_states = BackgroundStates.from_states(states)
+    toggles = rng.random((len(states), 2)) < 0.5
+
+    batch_flip(batch_states, toggles)
+    for state, (toggle_x, toggle_y) in zip(states, toggles):
+        if toggle_x:
+            state.toggle_flip_x()
+        if toggle_y:
+            state.toggle_flip_y()
+    assert_states_equal(batch_states, states)
+
+
+def test_batch_broadcasts_shared_deltas(rng):
+    states = make_states(rng, 4)
+    shared = BackgroundStates.from_states(states)
+    separate = BackgroundStates.from_states(states)
+    deltas = rng.normal(0, 20, (STEPS, 2))
+
+    batch_move(shared, deltas)
+    batch_move(separate, np.repeat(deltas[:, None], len(states), axis=1))
+    np.testing.assert_allclose(shared.offset, separate.offset)
+
+
+def test_write_background_state_round_trip():
+    bg = SimpleNamespace(offset=[0.0, 0.0], rotation=0.0, scale=1.0, use_flip_x=False, use_flip_y=False)
+    state = BackgroundState(0.25, -0.5, 1.0, 2.0, True, False)
+
+    write_background_state(bg, state)
+    assert bg.offset == [0.25, -0.5]
+    assert read_background_state(bg) == state